@@ -3,8 +3,15 @@ from __future__ import annotations
 
 import argparse
 import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
 
 def build_scene_names() -> list[str]:
     scenes = [f"FloorPlan{i}" for i in range(1, 31)]
@@ -19,21 +26,19 @@ def load_catalog(path: Path) -> dict:
 
 
 def save_catalog(path: Path, catalog: dict) -> None:
+    # orjson emits the same UTF-8, 2-space-indented layout as json.dumps(ensure_ascii=False),
+    # serialized in C; fall back to the stdlib encoder when it is not installed.
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(catalog, option=orjson.OPT_INDENT_2))
+        return
     path.write_text(json.dumps(catalog, ensure_ascii=False, indent=2), encoding="utf-8")
 
 
-def discover_objects(scenes: list[str], limit_scenes: int | None = None) -> set[str]:
-    try:
-        from ai2thor.controller import Controller
-    except Exception as exc:  # pragma: no cover
-        raise RuntimeError("ai2thor is not installed in this environment") from exc
-
-    selected = scenes[:limit_scenes] if limit_scenes else scenes
+def _discover_in_scenes(Controller, scenes: list[str]) -> set[str]:
     object_types: set[str] = set()
-
-    controller = Controller(scene=selected[0], width=300, height=300, quality="Very Low", renderDepthImage=False)
+    controller = Controller(scene=scenes[0], width=300, height=300, quality="Very Low", renderDepthImage=False)
     try:
-        for scene in selected:
+        for scene in scenes:
             controller.reset(scene)
             for obj in controller.last_event.metadata.get("objects", []):
                 obj_type = obj.get("objectType")
@@ -41,7 +46,27 @@ def discover_objects(scenes: list[str], limit_scenes: int | None = None) -> set[
                     object_types.add(obj_type)
     finally:
         controller.stop()
+    return object_types
 
+
+def discover_objects(scenes: list[str], limit_scenes: int | None = None, workers: int = 1) -> set[str]:
+    try:
+        from ai2thor.controller import Controller
+    except Exception as exc:  # pragma: no cover
+        raise RuntimeError("ai2thor is not installed in this environment") from exc
+
+    selected = scenes[:limit_scenes] if limit_scenes else scenes
+    # Scene loads are spent waiting on Unity, so each worker thread drives its own
+    # controller over an interleaved share of the scenes.
+    shard_count = max(1, min(workers, len(selected)))
+    shards = [selected[idx::shard_count] for idx in range(shard_count)]
+    if len(shards) == 1:
+        return _discover_in_scenes(Controller, shards[0])
+
+    object_types: set[str] = set()
+    with ThreadPoolExecutor(max_workers=len(shards)) as pool:
+        for found in pool.map(partial(_discover_in_scenes, Controller), shards):
+            object_types |= found
     return object_types
 
 
@@ -64,13 +89,14 @@ def main() -> int:
         help="Path to catalog yaml(json-compatible) file",
     )
     parser.add_argument("--limit-scenes", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=1, help="Number of AI2-THOR controllers scanning scenes in parallel")
     args = parser.parse_args()
 
     catalog_path = Path(args.catalog)
     catalog = load_catalog(catalog_path)
 
     scenes = build_scene_names()
-    discovered = discover_objects(scenes, limit_scenes=args.limit_scenes)
+    discovered = discover_objects(scenes, limit_scenes=args.limit_scenes, workers=args.workers)
     added = merge_objects(catalog, discovered)
     save_catalog(catalog_path, catalog)
 
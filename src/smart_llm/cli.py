@@ -2,16 +2,19 @@ from __future__ import annotations
 
 import argparse
 import json
+import logging
 import os
 import random
 from pathlib import Path
-from typing import Any, List
+from typing import TYPE_CHECKING, Any, List
 
 from smart_llm.benchmark import build_unseen_split, default_benchmark_path, load_benchmark
 from smart_llm.config import RuntimeConfig
 from smart_llm.env_loader import load_env_file
 from smart_llm.metrics import Evaluator, MetricsResult
-from smart_llm.pipeline import SMARTPipeline
+
+if TYPE_CHECKING:
+    from smart_llm.pipeline import SMARTPipeline
 
 
 def _build_parser() -> argparse.ArgumentParser:
@@ -31,7 +34,23 @@ def _build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--record-dir", default="output_videos", help="녹화 영상을 저장할 디렉토리")
     parser.add_argument("--observer-fov", type=float, default=35.0, help="fallback 상단 카메라 field of view")
     parser.add_argument("--observer-height-padding", type=float, default=0.0, help="공식 map-view orthographic size에 더할 여백")
+    parser.add_argument("--video-codec", default="auto", help="녹화용 ffmpeg 인코더 (auto: macOS는 h264_videotoolbox, 사용 가능한 NVIDIA GPU가 있으면 h264_nvenc, 그 외 libx264)")
+    parser.add_argument("--plan-batch-size", type=int, default=1, help="서로 다른 명령을 최대 N개씩 한 번의 LLM 요청으로 계획 (벤치마크용)")
+    parser.add_argument(
+        "--plan-cache",
+        nargs="?",
+        const="results/.plan_cache.json",
+        default=None,
+        help="같은 명령/scene/모델의 Stage 1 계획을 파일에 캐시해 LLM 호출을 생략 (기본 경로: results/.plan_cache.json)",
+    )
+    parser.add_argument("--llm-qpm", type=float, default=0.0, help="동시에 보내는 Stage 1 LLM 요청을 분당 N회로 제한 (0: 제한 없음)")
     parser.add_argument("--json", action="store_true", help="JSON 결과만 출력")
+    parser.add_argument(
+        "--log-level",
+        default="info",
+        choices=["debug", "info", "warning"],
+        help="stderr 진행 로그 수준 (info: 네비게이션 시작/결과, debug: 시도별·이동 루프 상세)",
+    )
     return parser
 
 
@@ -121,17 +140,30 @@ def run_command(args: argparse.Namespace) -> int:
         record_dir=args.record_dir,
         observer_fov=args.observer_fov,
         observer_height_padding=args.observer_height_padding,
+        video_codec=args.video_codec,
+        plan_batch_size=args.plan_batch_size,
+        plan_cache_path=args.plan_cache,
+        llm_qpm=args.llm_qpm,
     )
 
-    pipeline = SMARTPipeline(config)
+    # Imported here so --help and argument errors do not pay for numpy and the
+    # simulator adapter.
+    from smart_llm.pipeline import SMARTPipeline
+
+    # The pipeline keeps one simulator alive across every run below; shut it down once.
+    with SMARTPipeline(config) as pipeline:
+        return _run_pipeline(pipeline, args)
+
+
+def _run_pipeline(pipeline: SMARTPipeline, args: argparse.Namespace) -> int:
     evaluator = Evaluator()
 
     if not args.benchmark:
         metrics_runs: List[MetricsResult] = []
         last_result: dict[str, Any] = {}
 
-        for _ in range(max(1, args.runs)):
-            current_result = pipeline.run_once(args.command).__dict__
+        for plan in pipeline.plan_many([args.command] * max(1, args.runs)):
+            current_result = pipeline.run_once(args.command, plan=plan).__dict__
             last_result = current_result
             metrics_runs.append(_metrics_from_dict(current_result["metrics"]))
 
@@ -150,8 +182,9 @@ def run_command(args: argparse.Namespace) -> int:
     split = build_unseen_split(tasks, unseen_ratio=args.unseen_ratio, seed=args.seed)
 
     rows: List[dict[str, Any]] = []
-    for task in split.unseen:
-        run = pipeline.run_once(task.command, goal_states=task.goal_states)
+    plans = pipeline.plan_many([task.command for task in split.unseen])
+    for task, plan in zip(split.unseen, plans):
+        run = pipeline.run_once(task.command, goal_states=task.goal_states, plan=plan)
         rows.append({"category": task.category, "metrics": run.metrics, "task_id": task.task_id})
 
     category_rows = [{"category": r["category"], "metrics": _metrics_from_dict(r["metrics"])} for r in rows]
@@ -175,6 +208,7 @@ def main() -> int:
     load_env_file()
     parser = _build_parser()
     args = parser.parse_args()
+    logging.basicConfig(level=getattr(logging, args.log_level.upper()), format="%(message)s")
     return run_command(args)
 
 
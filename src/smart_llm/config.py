@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import List
+from typing import List, Optional
 
 from smart_llm.models import RobotSpec, SkillSpec
 
@@ -20,6 +20,10 @@ class RuntimeConfig:
     record_dir: str = "output_videos"
     observer_fov: float = 35.0
     observer_height_padding: float = 0.0
+    video_codec: str = "auto"
+    plan_batch_size: int = 1
+    plan_cache_path: Optional[str] = None
+    llm_qpm: float = 0.0
 
 
 def default_skills() -> List[SkillSpec]:
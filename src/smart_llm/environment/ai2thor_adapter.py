@@ -2,9 +2,13 @@ from __future__ import annotations
 
 import math
 from dataclasses import dataclass
+from functools import partial
+from itertools import islice
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Generator, List, Optional
+from typing import Any, Dict, Generator, List, Optional, Tuple
+
+import numpy as np
 
 from smart_llm.execution.actions import execute_action
 from smart_llm.models import EnvironmentObject
@@ -15,7 +19,13 @@ try:
 except Exception:  # pragma: no cover
     Controller = None  # type: ignore
 
-from .navigation_utils import TIGHT_INTERACTION_AGENT_CLEARANCE, navigate_to_object_iter
+from .navigation_utils import (
+    QUERY_STEP_OPTIONS,
+    TIGHT_INTERACTION_AGENT_CLEARANCE,
+    ReachableGrid,
+    navigate_to_object_iter,
+)
+from .video import FFMPEG_CODEC, ThreadedVideoWriter, open_video_writer
 
 
 THOR_PROFILES = {
@@ -48,6 +58,19 @@ THOR_PROFILES = {
     },
 }
 
+# Only RGB frames and object metadata are consumed, so every auxiliary image
+# channel stays off to keep the per-step Unity payload small.
+RENDER_CHANNELS = {
+    "renderDepthImage": False,
+    "renderInstanceSegmentation": False,
+    "renderSemanticSegmentation": False,
+    "renderNormalsImage": False,
+}
+
+# Navigation and interaction only read metadata (visibility is ray-cast, not pixel
+# based), so unrecorded sessions render at a fraction of the profile resolution.
+METADATA_ONLY_RENDER_SCALE = 0.4
+
 DEFAULT_INTERACTION_DISTANCE = 1.0
 PORTABLE_INTERACTION_DISTANCE = 1.15
 SWITCH_INTERACTION_DISTANCE = 1.5
@@ -55,6 +78,51 @@ FAUCET_INTERACTION_DISTANCE = 1.35
 RECEPTACLE_INTERACTION_DISTANCE = 1.35
 
 
+@dataclass
+class SceneIndex:
+    """Lookup tables extracted once from an event's object metadata."""
+
+    by_type: Dict[str, List[Dict[str, Any]]]
+    type_by_id: Dict[str, str]
+    # objectType -> {objectId: position in the objects list}, the hint form navigation expects.
+    slots_by_type: Dict[str, Dict[str, int]]
+
+
+def _index_scene(objects: List[Dict[str, Any]]) -> SceneIndex:
+    by_type: Dict[str, List[Dict[str, Any]]] = {}
+    type_by_id: Dict[str, str] = {}
+    slots_by_type: Dict[str, Dict[str, int]] = {}
+    for idx, obj in enumerate(objects):
+        object_type = obj.get("objectType")
+        by_type.setdefault(object_type, []).append(obj)
+        object_id = obj.get("objectId")
+        if object_id:
+            type_by_id[object_id] = object_type
+            slots_by_type.setdefault(object_type, {})[object_id] = idx
+    return SceneIndex(by_type=by_type, type_by_id=type_by_id, slots_by_type=slots_by_type)
+
+
+def _skip_capture(event=None, acting_agent_id: int | None = None) -> None:
+    return None
+
+
+class _MetadataOnlyController:
+    """Controller view whose steps skip the Unity render pass unless told otherwise.
+
+    Used while no frame is being recorded: visibility and distances are ray-cast, so
+    the metadata stays complete and only the unread images are dropped.
+    """
+
+    def __init__(self, controller):
+        self._controller = controller
+
+    def step(self, action=None, **kwargs):
+        return self._controller.step(action=action, **{**QUERY_STEP_OPTIONS, **kwargs})
+
+    def __getattr__(self, name):
+        return getattr(self._controller, name)
+
+
 @dataclass
 class ThorContext:
     controller: Optional[Any]
@@ -71,6 +139,7 @@ class AI2ThorAdapter:
         output_dir: str = "output_videos",
         observer_fov: float = 35.0,
         observer_height_padding: float = 0.0,
+        video_codec: str = FFMPEG_CODEC,
     ):
         if profile not in THOR_PROFILES:
             raise ValueError(f"Unknown profile: {profile}")
@@ -81,6 +150,7 @@ class AI2ThorAdapter:
         self.output_dir = Path(output_dir)
         self.observer_fov = observer_fov
         self.observer_height_padding = observer_height_padding
+        self.video_codec = video_codec
         self.frame_rate = THOR_PROFILES[self.profile]["targetFrameRate"]
         self.context = ThorContext(controller=None, agent_count=0)
         self.mock_objects: List[Dict[str, Any]] = []
@@ -89,7 +159,15 @@ class AI2ThorAdapter:
         self.agent_video_paths: Dict[str, str] = {}
         self._recording_timestamp: Optional[str] = None
         self._observer_writer = None
+        self._observer_frame = None
         self._agent_writers: Dict[int, Any] = {}
+        self._last_agent_frames: Dict[int, Any] = {}
+        self._scene_index_cache: Dict[int, Tuple[Dict[str, Any], SceneIndex]] = {}
+        self._mock_index: Optional[Tuple[int, SceneIndex]] = None
+        self._reachable_positions: Optional[ReachableGrid] = None
+        self._current_render_size: Optional[Tuple[int, int]] = None
+        self._capture = self._capture_all
+        self._step_controller = None
         self.max_interaction_distance = DEFAULT_INTERACTION_DISTANCE
         self.max_receptacle_distance = RECEPTACLE_INTERACTION_DISTANCE
 
@@ -117,7 +195,12 @@ class AI2ThorAdapter:
             "strict_max_distance": True,
         }
 
-    def start(self, agent_count: int) -> None:
+    def start(self, agent_count: int, *, record: bool = True) -> None:
+        """Launch the controller, or re-initialize the running one in place.
+
+        Calling `start` again on a live adapter resets the existing Unity process with
+        the new agent count instead of spawning another one.
+        """
         self.context.agent_count = agent_count
         if self.dry_run:
             self._reset_mock_world()
@@ -129,23 +212,73 @@ class AI2ThorAdapter:
                 "or `pip install ai2thor==5.0.0` in your active environment."
             )
 
-        config = dict(THOR_PROFILES[self.profile])
-        self.context.controller = Controller(agentCount=agent_count, **config)
-        if self.record_overhead_video:
+        config = {**RENDER_CHANNELS, **THOR_PROFILES[self.profile]}
+        width, height = self._render_size(record)
+        self._reachable_positions = None
+        if self.context.controller is None:
+            config.update(width=width, height=height)
+            self.context.controller = Controller(agentCount=agent_count, **config)
+        else:
+            self.context.controller.reset(scene=config["scene"], agentCount=agent_count)
+            self.observer_camera_id = None
+            if (width, height) != self._current_render_size:
+                self.context.controller.step(action="ChangeResolution", x=width, y=height)
+        self._current_render_size = (width, height)
+        if record and self.record_overhead_video:
             self._setup_overhead_camera()
-        if self.record_agent_video:
-            self.capture_agent_frames(self.context.controller.last_event)
+        self._bind_capture(record)
+        self.capture_recordings(self.context.controller.last_event)
+
+    def _render_size(self, record: bool) -> Tuple[int, int]:
+        profile = THOR_PROFILES[self.profile]
+        width, height = int(profile["width"]), int(profile["height"])
+        if record and (self.record_overhead_video or self.record_agent_video):
+            return width, height
+        return (
+            max(1, round(width * METADATA_ONLY_RENDER_SCALE)),
+            max(1, round(height * METADATA_ONLY_RENDER_SCALE)),
+        )
+
+    def finish_session(self) -> None:
+        """Flush this session's recordings but keep the simulator up for the next `start`.
+
+        Recording paths are cleared so the next session's videos get fresh names.
+        """
+        errors = self._release_writers()
+        self.observer_video_path = None
+        self.agent_video_paths = {}
+        self._recording_timestamp = None
+        if errors:
+            raise errors[0]
 
     def stop(self) -> None:
-        if self._observer_writer is not None:
-            self._observer_writer.release()
-            self._observer_writer = None
-        for writer in self._agent_writers.values():
-            writer.release()
-        self._agent_writers = {}
+        # Encoders drain on background threads; flush every writer and stop the
+        # controller even if one of them failed, then surface the first error.
+        errors = self._release_writers()
         if self.context.controller is not None:
             self.context.controller.stop()
             self.context.controller = None
+        if errors:
+            raise errors[0]
+
+    def _release_writers(self) -> List[Exception]:
+        writers = list(self._agent_writers.values())
+        if self._observer_writer is not None:
+            writers.insert(0, self._observer_writer)
+        self._observer_writer = None
+        self._observer_frame = None
+        self._agent_writers = {}
+        self._last_agent_frames = {}
+        self._capture = _skip_capture
+        self._step_controller = None
+
+        errors = []
+        for writer in writers:
+            try:
+                writer.release()
+            except Exception as exc:
+                errors.append(exc)
+        return errors
 
     def _metadata(self, agent_id: int = 0) -> Dict[str, Any]:
         if self.context.controller is None:
@@ -168,6 +301,7 @@ class AI2ThorAdapter:
         return self._event_metadata(event, agent_id).get("actionReturn")
 
     def _reset_mock_world(self) -> None:
+        self._mock_index = None
         self.mock_objects = [
             {
                 "objectId": "Tomato|1",
@@ -232,7 +366,7 @@ class AI2ThorAdapter:
         if self.context.controller is None:
             return
 
-        map_view = self.context.controller.step(action="GetMapViewCameraProperties")
+        map_view = self.context.controller.step(action="GetMapViewCameraProperties", **QUERY_STEP_OPTIONS)
         props = self._action_return(map_view) or {}
         if props:
             props = dict(props)
@@ -256,28 +390,32 @@ class AI2ThorAdapter:
         frames = getattr(event, "third_party_camera_frames", None) or []
         if not frames and getattr(event, "events", None):
             frames = getattr(event.events[0], "third_party_camera_frames", None) or []
-        self.observer_camera_id = len(frames) - 1 if frames else 0
-        self.capture_recordings(event)
+        if not self._last_action_success(event) or not frames:
+            # No overhead stream will ever arrive: leave the camera unset so every capture
+            # short-circuits and no overhead writer is opened.
+            self.observer_camera_id = None
+            return
+        self.observer_camera_id = len(frames) - 1
 
     def _recording_stamp(self) -> str:
         if self._recording_timestamp is None:
             self._recording_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         return self._recording_timestamp
 
-    def _write_video_frame(self, frame, writer_attr: str, path_attr: str, prefix: str, frame_id: int | None = None) -> None:
-        import cv2
+    def _open_video_writer(self, path: str, width: int, height: int):
+        return ThreadedVideoWriter(open_video_writer(path, width, height, self.frame_rate, codec=self.video_codec))
 
-        self.output_dir.mkdir(parents=True, exist_ok=True)
+    def _write_video_frame(self, frame, writer_attr: str, path_attr: str, prefix: str, frame_id: int | None = None) -> None:
         writer = getattr(self, writer_attr, None)
         if writer is None:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
             suffix = f"_{frame_id}" if frame_id is not None else ""
             path = str(self.output_dir / f"{prefix}{suffix}_{self._recording_stamp()}.mp4")
             height, width = frame.shape[:2]
-            fourcc = cv2.VideoWriter_fourcc(*"mp4v")
-            writer = cv2.VideoWriter(path, fourcc, self.frame_rate, (width, height))
+            writer = self._open_video_writer(path, width, height)
             setattr(self, writer_attr, writer)
             setattr(self, path_attr, path)
-        writer.write(cv2.cvtColor(frame, cv2.COLOR_RGB2BGR))
+        writer.write(frame)
 
     def capture_overhead_frame(self, event=None) -> None:
         if not self.record_overhead_video or self.context.controller is None or self.observer_camera_id is None:
@@ -298,9 +436,22 @@ class AI2ThorAdapter:
             return
 
         frame = frames[self.observer_camera_id]
+        # The map-view camera is static: when the frame is pixel-identical to the previous
+        # one (look up/down probes, interactions out of frame), re-write the previous frame
+        # object so the writer skips its copy/conversion.
+        if self._observer_frame is not None and np.array_equal(self._observer_frame, frame):
+            frame = self._observer_frame
+        else:
+            self._observer_frame = frame
         self._write_video_frame(frame, "_observer_writer", "observer_video_path", "overhead")
 
-    def capture_agent_frames(self, event=None) -> None:
+    def capture_agent_frames(self, event=None, acting_agent_id: int | None = None) -> None:
+        """Append the current POV frame of every agent to its video.
+
+        All agents share one scene, so every agent writes its own freshly rendered frame.
+        When a frame is pixel-identical to that agent's previous one, the previous frame
+        object is re-written so the writers skip the copy/conversion.
+        """
         if not self.record_agent_video or self.context.controller is None:
             return
 
@@ -311,7 +462,11 @@ class AI2ThorAdapter:
                 getattr(self.context.controller.last_event, "events", None),
                 [],
             )
-            frames = [(idx, agent_event.frame) for idx, agent_event in enumerate(agent_events) if getattr(agent_event, "frame", None) is not None]
+            frames = [
+                (idx, agent_event.frame)
+                for idx, agent_event in enumerate(agent_events)
+                if getattr(agent_event, "frame", None) is not None
+            ]
         else:
             frame = self._coalesce(
                 getattr(event, "frame", None),
@@ -323,22 +478,44 @@ class AI2ThorAdapter:
             if frame is None:
                 continue
             if agent_id not in self._agent_writers:
-                import cv2
-
                 self.output_dir.mkdir(parents=True, exist_ok=True)
                 path = str(self.output_dir / f"agent{agent_id}_{self._recording_stamp()}.mp4")
                 height, width = frame.shape[:2]
-                fourcc = cv2.VideoWriter_fourcc(*"mp4v")
-                self._agent_writers[agent_id] = cv2.VideoWriter(path, fourcc, self.frame_rate, (width, height))
+                self._agent_writers[agent_id] = self._open_video_writer(path, width, height)
                 self.agent_video_paths[f"agent{agent_id}"] = path
 
-            import cv2
-
-            self._agent_writers[agent_id].write(cv2.cvtColor(frame, cv2.COLOR_RGB2BGR))
+            previous = self._last_agent_frames.get(agent_id)
+            if previous is not None and np.array_equal(previous, frame):
+                frame = previous
+            self._last_agent_frames[agent_id] = frame
+            self._agent_writers[agent_id].write(frame)
 
-    def capture_recordings(self, event=None) -> None:
+    def _capture_all(self, event=None, acting_agent_id: int | None = None) -> None:
         self.capture_overhead_frame(event)
-        self.capture_agent_frames(event)
+        self.capture_agent_frames(event, acting_agent_id=acting_agent_id)
+
+    def _bind_capture(self, record: bool) -> None:
+        """Pick the capture path once per session instead of re-checking streams every step."""
+        overhead = record and self.record_overhead_video and self.observer_camera_id is not None
+        agents = record and self.record_agent_video
+        if overhead and agents:
+            self._capture = self._capture_all
+        elif overhead:
+            capture_overhead_frame = self.capture_overhead_frame
+            self._capture = lambda event=None, acting_agent_id=None: capture_overhead_frame(event)
+        elif agents:
+            self._capture = self.capture_agent_frames
+        else:
+            self._capture = _skip_capture
+        # Actions and navigation step through this view; with nothing captured, none of
+        # their frames are read, so they skip rendering altogether.
+        controller = self.context.controller
+        if controller is not None and self._capture is _skip_capture:
+            controller = _MetadataOnlyController(controller)
+        self._step_controller = controller
+
+    def capture_recordings(self, event=None, acting_agent_id: int | None = None) -> None:
+        self._capture(event, acting_agent_id=acting_agent_id)
 
     def artifacts(self) -> Dict[str, Any]:
         artifacts = {}
@@ -348,11 +525,32 @@ class AI2ThorAdapter:
             artifacts["agent_videos"] = dict(self.agent_video_paths)
         return artifacts
 
+    def _steps(self):
+        """Controller to issue action/navigation steps through for the current session."""
+        return self._step_controller or self.context.controller
+
     def _object_rows(self, agent_id: int = 0) -> List[Dict[str, Any]]:
         if self.dry_run:
             return self.mock_objects
         return list(self._metadata(agent_id).get("objects", []))
 
+    def _scene_index(self, agent_id: int = 0) -> SceneIndex:
+        """Per-event object index, rebuilt only when the agent's metadata changes."""
+        if self.dry_run:
+            # Mock objects only change type membership by being appended (slicing).
+            if self._mock_index is None or self._mock_index[0] != len(self.mock_objects):
+                self._mock_index = (len(self.mock_objects), _index_scene(self.mock_objects))
+            return self._mock_index[1]
+        metadata = self._metadata(agent_id)
+        cached = self._scene_index_cache.get(agent_id)
+        if cached is None or cached[0] is not metadata:
+            cached = (metadata, _index_scene(metadata.get("objects", [])))
+            self._scene_index_cache[agent_id] = cached
+        return cached[1]
+
+    def _objects_by_type(self, agent_id: int = 0) -> Dict[str, List[Dict[str, Any]]]:
+        return self._scene_index(agent_id).by_type
+
     def _inventory_rows(self, agent_id: int = 0) -> List[Dict[str, Any]]:
         if self.dry_run:
             return []
@@ -362,23 +560,23 @@ class AI2ThorAdapter:
         inventory_types = {obj.get("objectType") for obj in self._inventory_rows(agent_id)}
         return any(object_type in inventory_types for object_type in object_types)
 
-    def list_environment_objects(self, agent_id: int = 0) -> List[EnvironmentObject]:
-        objects = []
-        for obj in self._object_rows(agent_id):
-            objects.append(
-                EnvironmentObject(
-                    objectType=obj.get("objectType", "Unknown"),
-                    state={
-                        "visible": obj.get("visible"),
-                        "isOpen": obj.get("isOpen"),
-                        "isToggled": obj.get("isToggled"),
-                        "isPickedUp": obj.get("isPickedUp"),
-                    },
-                    position=obj.get("position", {}),
-                    affordance=obj.get("salientMaterials", []),
-                )
+    def list_environment_objects(self, agent_id: int = 0, limit: int | None = None) -> List[EnvironmentObject]:
+        # Only the first `limit` rows are converted; callers that serialize a prefix of the
+        # scene (the stage-1 prompt) skip building objects they would discard.
+        return [
+            EnvironmentObject(
+                objectType=obj.get("objectType", "Unknown"),
+                state={
+                    "visible": obj.get("visible"),
+                    "isOpen": obj.get("isOpen"),
+                    "isToggled": obj.get("isToggled"),
+                    "isPickedUp": obj.get("isPickedUp"),
+                },
+                position=obj.get("position", {}),
+                affordance=obj.get("salientMaterials", []),
             )
-        return objects
+            for obj in islice(self._object_rows(agent_id), limit)
+        ]
 
     def _find_visible(
         self,
@@ -387,8 +585,8 @@ class AI2ThorAdapter:
         max_distance: float | None = None,
     ) -> Optional[Dict[str, Any]]:
         matches = []
-        for obj in self._object_rows(agent_id):
-            if obj.get("objectType") != object_type or not obj.get("visible"):
+        for obj in self._objects_by_type(agent_id).get(object_type, ()):
+            if not obj.get("visible"):
                 continue
             if max_distance is not None:
                 distance = obj.get("distance")
@@ -400,10 +598,8 @@ class AI2ThorAdapter:
         return min(matches, key=lambda row: float(row.get("distance", 999.0)))
 
     def _find_any(self, object_type: str, agent_id: int = 0) -> Optional[Dict[str, Any]]:
-        for obj in self._object_rows(agent_id):
-            if obj.get("objectType") == object_type:
-                return obj
-        return None
+        rows = self._objects_by_type(agent_id).get(object_type)
+        return rows[0] if rows else None
 
     def _find_by_id(self, object_id: str) -> Optional[Dict[str, Any]]:
         for obj in self.mock_objects:
@@ -536,23 +732,23 @@ class AI2ThorAdapter:
     def _ensure_open(self, target: Dict[str, Any], agent_id: int) -> bool:
         if target.get("isOpen"):
             return True
-        event = self.context.controller.step(action="OpenObject", objectId=target["objectId"], agentId=agent_id)
-        self.capture_recordings(event)
+        event = self._steps().step(action="OpenObject", objectId=target["objectId"], agentId=agent_id)
+        self.capture_recordings(event, acting_agent_id=agent_id)
         return self._last_action_success(event, agent_id)
 
     def _ensure_closed(self, target: Dict[str, Any], agent_id: int) -> bool:
         if not target.get("isOpen"):
             return True
-        event = self.context.controller.step(action="CloseObject", objectId=target["objectId"], agentId=agent_id)
-        self.capture_recordings(event)
+        event = self._steps().step(action="CloseObject", objectId=target["objectId"], agentId=agent_id)
+        self.capture_recordings(event, acting_agent_id=agent_id)
         return self._last_action_success(event, agent_id)
 
     def _pick_visible(self, object_type: str, agent_id: int, max_distance: float | None = None) -> bool:
         obj = self._find_visible(object_type, agent_id, max_distance=max_distance)
         if obj is None:
             return False
-        event = self.context.controller.step(action="PickupObject", objectId=obj["objectId"], agentId=agent_id)
-        self.capture_recordings(event)
+        event = self._steps().step(action="PickupObject", objectId=obj["objectId"], agentId=agent_id)
+        self.capture_recordings(event, acting_agent_id=agent_id)
         return self._last_action_success(event, agent_id)
 
     def _toggle_visible(
@@ -565,10 +761,125 @@ class AI2ThorAdapter:
         obj = self._find_visible(object_type, agent_id, max_distance=max_distance)
         if obj is None:
             return False
-        event = self.context.controller.step(action=thor_action, objectId=obj["objectId"], agentId=agent_id)
-        self.capture_recordings(event)
+        event = self._steps().step(action=thor_action, objectId=obj["objectId"], agentId=agent_id)
+        self.capture_recordings(event, acting_agent_id=agent_id)
         return self._last_action_success(event, agent_id)
 
+    def _reachable_positions_for(self, agent_id: int) -> Optional[ReachableGrid]:
+        # The navigable grid is fixed for a scene, so one query (and one spatial index)
+        # serves every navigation.
+        if self._reachable_positions is None:
+            event = self.context.controller.step(action="GetReachablePositions", agentId=agent_id, **QUERY_STEP_OPTIONS)
+            if not self._last_action_success(event, agent_id):
+                return None
+            positions = list(self._action_return(event, agent_id) or [])
+            # THOR leaves out the cells the other agents stand on at query time; add every
+            # agent's own cell back so a shared grid still covers their start positions.
+            known = {(round(pos["x"], 2), round(pos["z"], 2)) for pos in positions}
+            for other_id in range(max(self.context.agent_count, 1)):
+                pos = (self._event_metadata(event, other_id).get("agent") or {}).get("position")
+                if not pos:
+                    continue
+                cell = (round(pos["x"], 2), round(pos["z"], 2))
+                if cell not in known:
+                    known.add(cell)
+                    positions.append({"x": pos["x"], "y": pos.get("y", 0.0), "z": pos["z"]})
+            self._reachable_positions = ReachableGrid(positions)
+        return self._reachable_positions
+
+    def prefetch_reachable_positions(self) -> None:
+        """Query and index the scene's reachable grid ahead of the first navigation."""
+        if self.dry_run or self.context.controller is None:
+            return
+        self._reachable_positions_for(0)
+
+    def _navigate_to_object_iter(
+        self,
+        agent_id: int,
+        object_type: str,
+        capture_callback,
+        **kwargs: Any,
+    ) -> Generator[ActionResult, None, bool]:
+        return navigate_to_object_iter(
+            self._steps(),
+            agent_id,
+            object_type,
+            capture_callback,
+            reachable_positions=self._reachable_positions_for(agent_id),
+            candidate_ids=self._scene_index(agent_id).slots_by_type.get(object_type),
+            **kwargs,
+        )
+
+    def _navigate_to_visible_iter(
+        self,
+        agent_id: int,
+        object_type: str,
+        capture_callback,
+        not_visible_message: str,
+        **navigation_kwargs: Any,
+    ) -> Generator[ActionResult, None, Optional[Dict[str, Any]]]:
+        navigated = yield from self._navigate_to_object_iter(agent_id, object_type, capture_callback, **navigation_kwargs)
+        if not navigated:
+            return None
+        obj = self._find_visible(object_type, agent_id)
+        if obj is None:
+            yield self._action_result(False, not_visible_message, transitions=0)
+        return obj
+
+    def _navigate_and_pick_iter(
+        self,
+        agent_id: int,
+        object_type: str,
+        capture_callback,
+        label: str,
+    ) -> Generator[ActionResult, None, bool]:
+        pickup_distance = self._interaction_distance_for(object_type, portable=True)
+        navigated = yield from self._navigate_to_object_iter(
+            agent_id,
+            object_type,
+            capture_callback,
+            **self._tight_interaction_navigation_kwargs(pickup_distance),
+        )
+        if not navigated:
+            return False
+        return (yield from self._emit_execute_action(
+            lambda: self._pick_visible(object_type, agent_id),
+            f"{label}:pickup",
+        ))
+
+    def _navigate_and_toggle_iter(
+        self,
+        agent_id: int,
+        object_type: str,
+        thor_action: str,
+        capture_callback,
+        label: str,
+    ) -> Generator[ActionResult, None, bool]:
+        navigated = yield from self._navigate_to_object_iter(
+            agent_id,
+            object_type,
+            capture_callback,
+            max_distance=self._interaction_distance_for(object_type),
+        )
+        if not navigated:
+            return False
+        return (yield from self._emit_execute_action(
+            lambda: self._toggle_visible(object_type, thor_action, agent_id),
+            f"{label}:toggle",
+        ))
+
+    def _put_object_iter(self, receptacle: Dict[str, Any], agent_id: int, label: str) -> Generator[ActionResult, None, bool]:
+        event = self._steps().step(
+            action="PutObject",
+            objectId=receptacle["objectId"],
+            forceAction=True,
+            agentId=agent_id,
+        )
+        self.capture_recordings(event, acting_agent_id=agent_id)
+        ok = self._last_action_success(event, agent_id)
+        yield self._action_result(ok, f"{label}:put")
+        return ok
+
     def _action_result(self, ok: bool, message: str, transitions: int = 1) -> ActionResult:
         status = "success" if ok else "failure"
         return ActionResult(success=ok, status=status, message=message, transitions=transitions)
@@ -593,7 +904,7 @@ class AI2ThorAdapter:
         if self.context.controller is None:
             raise RuntimeError("AI2-THOR controller is not started")
 
-        capture_callback = self.capture_recordings
+        capture_callback = partial(self.capture_recordings, acting_agent_id=agent_id)
 
         if task_type == "navigate" and step_name == "navigate":
             target = parameters.get("target_object")
@@ -601,8 +912,7 @@ class AI2ThorAdapter:
                 yield self._action_result(False, f"{task_type}:{step_name}:missing_target", transitions=0)
                 return False
             return (
-                yield from navigate_to_object_iter(
-                    self.context.controller,
+                yield from self._navigate_to_object_iter(
                     agent_id,
                     target,
                     capture_callback,
@@ -610,70 +920,49 @@ class AI2ThorAdapter:
                 )
             )
 
+        label = f"{task_type}:{step_name}"
+
         if task_type == "toggle_light" and step_name == "navigate_and_toggle":
             action = parameters.get("action")
             if action not in {"켜기", "끄기"}:
-                yield self._action_result(False, f"{task_type}:{step_name}:missing_action", transitions=0)
-                return False
-            max_distance = self._interaction_distance_for("LightSwitch")
-            navigated = yield from navigate_to_object_iter(
-                self.context.controller,
-                agent_id,
-                "LightSwitch",
-                capture_callback,
-                max_distance=max_distance,
-            )
-            if not navigated:
+                yield self._action_result(False, f"{label}:missing_action", transitions=0)
                 return False
             thor_action = "ToggleObjectOn" if action == "켜기" else "ToggleObjectOff"
-            return (yield from self._emit_execute_action(
-                lambda: self._toggle_visible(
-                        "LightSwitch",
-                        thor_action,
-                        agent_id,
-                    ),
-                    f"{task_type}:{step_name}:toggle",
-                ))
+            return (yield from self._navigate_and_toggle_iter(agent_id, "LightSwitch", thor_action, capture_callback, label))
 
         if task_type == "slice_and_store":
             source_object = parameters.get("source_object")
             target_object = parameters.get("target_object")
             if not source_object or not target_object:
-                yield self._action_result(False, f"{task_type}:{step_name}:missing_parameters", transitions=0)
+                yield self._action_result(False, f"{label}:missing_parameters", transitions=0)
                 return False
 
             if step_name == "prepare_source":
                 source_distance = self._interaction_distance_for(source_object, portable=True)
                 if self._find_any(source_object + "Sliced", agent_id):
-                    yield self._action_result(True, f"{task_type}:{step_name}:already_sliced", transitions=0)
+                    yield self._action_result(True, f"{label}:already_sliced", transitions=0)
                     return True
-                navigated = yield from navigate_to_object_iter(
-                    self.context.controller,
+                source = yield from self._navigate_to_visible_iter(
                     agent_id,
                     source_object,
                     capture_callback,
+                    f"{label}:source_not_visible",
                     **self._tight_interaction_navigation_kwargs(source_distance),
                 )
-                if not navigated:
-                    return False
-                source = self._find_visible(source_object, agent_id)
                 if source is None:
-                    yield self._action_result(False, f"{task_type}:{step_name}:source_not_visible", transitions=0)
                     return False
-                event = self.context.controller.step(action="SliceObject", objectId=source["objectId"], agentId=agent_id)
-                self.capture_recordings(event)
+                event = self._steps().step(action="SliceObject", objectId=source["objectId"], agentId=agent_id)
+                self.capture_recordings(event, acting_agent_id=agent_id)
                 ok = self._last_action_success(event, agent_id)
-                yield self._action_result(ok, f"{task_type}:{step_name}:slice")
+                yield self._action_result(ok, f"{label}:slice")
                 return ok
 
             if step_name == "transport_and_store":
                 carrying_source = self._inventory_contains([source_object + "Sliced", source_object], agent_id=agent_id)
                 pickup_distance = self._interaction_distance_for(source_object, portable=True)
-                target_distance = self._interaction_distance_for(target_object)
                 if not carrying_source:
                     pickup_target = source_object + "Sliced" if self._find_any(source_object + "Sliced", agent_id) else source_object
-                    navigated = yield from navigate_to_object_iter(
-                        self.context.controller,
+                    navigated = yield from self._navigate_to_object_iter(
                         agent_id,
                         pickup_target,
                         capture_callback,
@@ -683,128 +972,83 @@ class AI2ThorAdapter:
                         return False
                     sliced = self._find_visible(source_object + "Sliced", agent_id)
                     if sliced is None:
-                        yield self._action_result(False, f"{task_type}:{step_name}:sliced_not_visible", transitions=0)
+                        yield self._action_result(False, f"{label}:sliced_not_visible", transitions=0)
                         return False
                     picked = yield from self._emit_execute_action(
                         lambda: self._pick_visible(
                             sliced["objectType"],
                             agent_id,
                         ),
-                        f"{task_type}:{step_name}:pickup",
+                        f"{label}:pickup",
                     )
                     if not picked:
                         return False
-                navigated = yield from navigate_to_object_iter(
-                    self.context.controller,
+                target = yield from self._navigate_to_visible_iter(
                     agent_id,
                     target_object,
                     capture_callback,
-                    max_distance=target_distance,
+                    f"{label}:target_not_visible",
+                    max_distance=self._interaction_distance_for(target_object),
                 )
-                if not navigated:
-                    return False
-                target = self._find_visible(target_object, agent_id)
                 if target is None:
-                    yield self._action_result(False, f"{task_type}:{step_name}:target_not_visible", transitions=0)
                     return False
                 opened = yield from self._emit_execute_action(
                     lambda: self._ensure_open(target, agent_id),
-                    f"{task_type}:{step_name}:open",
+                    f"{label}:open",
                 )
                 if not opened:
                     return False
-                put_event = self.context.controller.step(
-                    action="PutObject",
-                    objectId=target["objectId"],
-                    forceAction=True,
-                    agentId=agent_id,
-                )
-                self.capture_recordings(put_event)
-                ok = self._last_action_success(put_event, agent_id)
-                yield self._action_result(ok, f"{task_type}:{step_name}:put")
-                return ok
+                return (yield from self._put_object_iter(target, agent_id, label))
 
         if task_type == "heat_object":
             obj_type = parameters.get("object")
-            portable_distance = self._interaction_distance_for(obj_type, portable=True)
             microwave_distance = self._interaction_distance_for("Microwave")
             if step_name == "load_microwave":
                 if not obj_type:
-                    yield self._action_result(False, f"{task_type}:{step_name}:missing_object", transitions=0)
+                    yield self._action_result(False, f"{label}:missing_object", transitions=0)
                     return False
-                navigated = yield from navigate_to_object_iter(
-                    self.context.controller,
-                    agent_id,
-                    obj_type,
-                    capture_callback,
-                    **self._tight_interaction_navigation_kwargs(portable_distance),
-                )
-                if not navigated:
-                    return False
-                picked = yield from self._emit_execute_action(
-                    lambda: self._pick_visible(
-                        obj_type,
-                        agent_id,
-                    ),
-                    f"{task_type}:{step_name}:pickup",
-                )
+                picked = yield from self._navigate_and_pick_iter(agent_id, obj_type, capture_callback, label)
                 if not picked:
                     return False
-                navigated = yield from navigate_to_object_iter(
-                    self.context.controller,
+                microwave = yield from self._navigate_to_visible_iter(
                     agent_id,
                     "Microwave",
                     capture_callback,
+                    f"{label}:microwave_not_visible",
                     max_distance=microwave_distance,
                 )
-                if not navigated:
-                    return False
-                microwave = self._find_visible("Microwave", agent_id)
                 if microwave is None:
-                    yield self._action_result(False, f"{task_type}:{step_name}:microwave_not_visible", transitions=0)
                     return False
                 opened = yield from self._emit_execute_action(
                     lambda: self._ensure_open(microwave, agent_id),
-                    f"{task_type}:{step_name}:open",
+                    f"{label}:open",
                 )
                 if not opened:
                     return False
-                put_event = self.context.controller.step(
-                    action="PutObject",
-                    objectId=microwave["objectId"],
-                    forceAction=True,
-                    agentId=agent_id,
-                )
-                self.capture_recordings(put_event)
-                put_ok = self._last_action_success(put_event, agent_id)
-                yield self._action_result(put_ok, f"{task_type}:{step_name}:put")
+                put_ok = yield from self._put_object_iter(microwave, agent_id, label)
                 if not put_ok:
                     return False
                 microwave = self._find_visible("Microwave", agent_id)
                 if microwave is None:
-                    yield self._action_result(False, f"{task_type}:{step_name}:microwave_lost", transitions=0)
+                    yield self._action_result(False, f"{label}:microwave_lost", transitions=0)
                     return False
                 return (yield from self._emit_execute_action(
                     lambda: self._ensure_closed(microwave, agent_id),
-                    f"{task_type}:{step_name}:close",
+                    f"{label}:close",
                 ))
             if step_name == "activate_microwave":
-                navigated = yield from navigate_to_object_iter(
-                    self.context.controller,
+                microwave = yield from self._navigate_to_visible_iter(
                     agent_id,
                     "Microwave",
                     capture_callback,
+                    f"{label}:microwave_not_visible",
                     max_distance=microwave_distance,
                 )
-                if not navigated:
-                    return False
-                microwave = self._find_visible("Microwave", agent_id)
                 if microwave is None:
-                    yield self._action_result(False, f"{task_type}:{step_name}:microwave_not_visible", transitions=0)
                     return False
                 closed = yield from self._emit_execute_action(
                     lambda: self._ensure_closed(microwave, agent_id),
-                    f"{task_type}:{step_name}:close",
+                    f"{label}:close",
                 )
                 if not closed:
                     return False
@@ -814,79 +1058,32 @@ class AI2ThorAdapter:
                         "ToggleObjectOn",
                         agent_id,
                     ),
-                    f"{task_type}:{step_name}:toggle",
+                    f"{label}:toggle",
                 ))
 
         if task_type == "clean_object":
             obj_type = parameters.get("object")
-            portable_distance = self._interaction_distance_for(obj_type, portable=True)
-            sink_distance = self._interaction_distance_for("SinkBasin")
-            faucet_distance = self._interaction_distance_for("Faucet")
             if step_name == "place_in_sink":
                 if not obj_type:
-                    yield self._action_result(False, f"{task_type}:{step_name}:missing_object", transitions=0)
+                    yield self._action_result(False, f"{label}:missing_object", transitions=0)
                     return False
-                navigated = yield from navigate_to_object_iter(
-                    self.context.controller,
-                    agent_id,
-                    obj_type,
-                    capture_callback,
-                    **self._tight_interaction_navigation_kwargs(portable_distance),
-                )
-                if not navigated:
-                    return False
-                picked = yield from self._emit_execute_action(
-                    lambda: self._pick_visible(
-                        obj_type,
-                        agent_id,
-                    ),
-                    f"{task_type}:{step_name}:pickup",
-                )
+                picked = yield from self._navigate_and_pick_iter(agent_id, obj_type, capture_callback, label)
                 if not picked:
                     return False
-                navigated = yield from navigate_to_object_iter(
-                    self.context.controller,
+                sink = yield from self._navigate_to_visible_iter(
                     agent_id,
                     "SinkBasin",
                     capture_callback,
-                    max_distance=sink_distance,
+                    f"{label}:sink_not_visible",
+                    max_distance=self._interaction_distance_for("SinkBasin"),
                 )
-                if not navigated:
-                    return False
-                sink = self._find_visible("SinkBasin", agent_id)
                 if sink is None:
-                    yield self._action_result(False, f"{task_type}:{step_name}:sink_not_visible", transitions=0)
                     return False
-                put_event = self.context.controller.step(
-                    action="PutObject",
-                    objectId=sink["objectId"],
-                    forceAction=True,
-                    agentId=agent_id,
-                )
-                self.capture_recordings(put_event)
-                ok = self._last_action_success(put_event, agent_id)
-                yield self._action_result(ok, f"{task_type}:{step_name}:put")
-                return ok
+                return (yield from self._put_object_iter(sink, agent_id, label))
             if step_name == "toggle_faucet":
-                navigated = yield from navigate_to_object_iter(
-                    self.context.controller,
-                    agent_id,
-                    "Faucet",
-                    capture_callback,
-                    max_distance=faucet_distance,
-                )
-                if not navigated:
-                    return False
-                return (yield from self._emit_execute_action(
-                    lambda: self._toggle_visible(
-                        "Faucet",
-                        "ToggleObjectOn",
-                        agent_id,
-                    ),
-                    f"{task_type}:{step_name}:toggle",
-                ))
+                return (yield from self._navigate_and_toggle_iter(agent_id, "Faucet", "ToggleObjectOn", capture_callback, label))
 
-        yield self._action_result(False, f"{task_type}:{step_name}:unsupported", transitions=0)
+        yield self._action_result(False, f"{label}:unsupported", transitions=0)
         return False
 
     def execute_step(self, task_type: str, step_name: str, parameters: Dict[str, Any], agent_id: int = 0) -> bool:
@@ -919,14 +1116,15 @@ class AI2ThorAdapter:
         if not goal_states:
             return []
 
-        objects = self._object_rows(agent_id)
-        object_types_by_id = {obj.get("objectId"): obj.get("objectType") for obj in objects if obj.get("objectId")}
+        scene = self._scene_index(agent_id)
+        objects_by_type = scene.by_type
+        object_types_by_id = scene.type_by_id
         results: List[bool] = []
 
         for goal in goal_states:
             object_type = goal.get("objectType")
             expected_state = goal.get("state", {})
-            matches = [obj for obj in objects if obj.get("objectType") == object_type]
+            matches = objects_by_type.get(object_type, [])
 
             exists_expected = expected_state.get("exists")
             if exists_expected is not None:
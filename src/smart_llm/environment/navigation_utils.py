@@ -7,8 +7,13 @@ Navigation Utilities for AI2-THOR
 
 from __future__ import annotations
 
+import heapq
+import logging
 import math
-from typing import Any, Dict, Generator, List, Sequence, Tuple
+from math import atan2, degrees, hypot, remainder, sqrt
+from typing import Any, Dict, Generator, List, Sequence, Set, Tuple
+
+import numpy as np
 
 from smart_llm.models import ActionResult
 
@@ -17,31 +22,63 @@ INTERACTABLE_ROTATIONS = list(range(0, 360, 30))
 INTERACTABLE_HORIZONS = [-30, 0, 30, 60]
 ARRIVAL_TOLERANCE = 0.25
 WAYPOINT_TOLERANCE = 0.15
+MIN_PROGRESS_DISTANCE = 0.02
+# 매 스텝 비교는 sqrt 없이 제곱 거리로 한다.
+ARRIVAL_TOLERANCE_SQ = ARRIVAL_TOLERANCE * ARRIVAL_TOLERANCE
+WAYPOINT_TOLERANCE_SQ = WAYPOINT_TOLERANCE * WAYPOINT_TOLERANCE
+MIN_PROGRESS_SQ = MIN_PROGRESS_DISTANCE * MIN_PROGRESS_DISTANCE
 AGENT_CLEARANCE = 0.75
 TIGHT_INTERACTION_AGENT_CLEARANCE = 0.5
 FALLBACK_POSE_RADIUS = 2.25
+POSE_ATTEMPTS = 5
 STRICT_DISTANCE_GEOMETRY_MARGIN = 0.6
+REACHABLE_GRID_CELL_SIZE = 0.5
+# 메타데이터만 돌려주는 조회 액션은 Unity 렌더링/이미지 전송을 생략한다.
+QUERY_STEP_OPTIONS = {"renderImage": False}
+# AI2-THOR 카메라 horizon 한계 (아래가 +)
+MIN_CAMERA_HORIZON = -30.0
+MAX_CAMERA_HORIZON = 60.0
+VISIBILITY_SWEEP_DEGREES = 30.0
+# MoveAhead 한 번의 최대 보폭 (제곱값은 루프 안 비교용)
+MAX_MOVE_MAGNITUDE = 0.25
+MAX_MOVE_MAGNITUDE_SQ = MAX_MOVE_MAGNITUDE * MAX_MOVE_MAGNITUDE
+# AI2-THOR 기본 gridSize. 8방향 이웃까지를 reachable 그래프의 간선으로 본다.
+REACHABLE_GRID_STEP = 0.25
+# 네비게이션 시작/결과는 info, 시도별·루프 내부 메시지는 debug 로그로 남긴다.
+logger = logging.getLogger(__name__)
 
 
 def calculate_distance(pos1, pos2):
     """두 위치 간 2D 거리"""
-    return math.sqrt((pos1['x'] - pos2['x'])**2 + (pos1['z'] - pos2['z'])**2)
+    return hypot(pos1['x'] - pos2['x'], pos1['z'] - pos2['z'])
+
+
+def squared_distance(pos1, pos2):
+    """두 위치 간 2D 거리의 제곱 (비교 전용, sqrt 생략)"""
+    dx = pos1['x'] - pos2['x']
+    dz = pos1['z'] - pos2['z']
+    return dx * dx + dz * dz
 
 
 def calculate_angle(from_pos, to_pos):
     """목표 방향의 각도 (degrees)"""
     dx = to_pos['x'] - from_pos['x']
     dz = to_pos['z'] - from_pos['z']
-    return math.degrees(math.atan2(dx, dz))
+    return degrees(atan2(dx, dz))
 
 
 def normalize_angle(angle):
-    """각도를 -180~180 범위로 정규화"""
-    while angle > 180:
-        angle -= 360
-    while angle < -180:
-        angle += 360
-    return angle
+    """각도를 (-180, 180] 범위로 정규화 (반복 없이 modulo 한 번)"""
+    return 180.0 - (180.0 - angle) % 360.0
+
+
+def heading_error(from_pos, to_pos, rotation_y):
+    """현재 yaw에서 목표 방향까지 회전해야 할 각도 [-180, 180]. calculate_angle + normalize_angle을 한 번에.
+
+    math.remainder 한 번으로 래핑 (정확히 ±180일 때는 부호가 어느 쪽이든 같은 회전량).
+    """
+    angle = degrees(atan2(to_pos['x'] - from_pos['x'], to_pos['z'] - from_pos['z']))
+    return remainder(angle - rotation_y, 360.0)
 
 
 def path_length(corners: Sequence[Dict[str, float]]) -> float:
@@ -76,6 +113,10 @@ def _step_kwargs(agent_id):
     return {"agentId": agent_id} if agent_id is not None else {}
 
 
+def _query_step_kwargs(agent_id):
+    return {**_step_kwargs(agent_id), **QUERY_STEP_OPTIONS}
+
+
 def _capture(capture_callback, event=None):
     try:
         capture_callback(event)
@@ -98,7 +139,159 @@ def _other_agent_positions(controller, agent_id) -> List[Dict[str, float]]:
 def _min_clearance(position: Dict[str, float], blockers: Sequence[Dict[str, float]]) -> float:
     if not blockers:
         return 999.0
-    return min(calculate_distance(position, blocker) for blocker in blockers)
+    return sqrt(min(squared_distance(position, blocker) for blocker in blockers))
+
+
+class ReachableGrid:
+    """reachable 위치의 격자 버킷 인덱스 (반경/최근접 질의). 결과 인덱스는 선형 스캔과 같은 오름차순."""
+
+    def __init__(self, positions: Sequence[Dict[str, float]], cell_size: float = REACHABLE_GRID_CELL_SIZE):
+        self.positions = list(positions)
+        self.cell_size = cell_size
+        # (N, 2) 배열을 한 번에 채우고 버킷 키도 배열에서 한 번에 구한다.
+        self._xz = np.fromiter(
+            ((pos["x"], pos["z"]) for pos in self.positions),
+            dtype=np.dtype((np.float64, 2)),
+            count=len(self.positions),
+        )
+        cell_keys = np.floor(self._xz / cell_size).astype(np.int64).tolist()
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+        for idx, (cx, cz) in enumerate(cell_keys):
+            self._cells.setdefault((cx, cz), []).append(idx)
+        self._neighbors: List[List[Tuple[int, float]]] | None = None
+        self._path_lengths: Dict[int, List[float]] = {}
+
+    def _cell(self, x: float, z: float) -> Tuple[int, int]:
+        return (math.floor(x / self.cell_size), math.floor(z / self.cell_size))
+
+    def _cells_around(self, center: Dict[str, float], radius: float):
+        min_cx, min_cz = self._cell(center["x"] - radius, center["z"] - radius)
+        max_cx, max_cz = self._cell(center["x"] + radius, center["z"] + radius)
+        for cx in range(min_cx, max_cx + 1):
+            for cz in range(min_cz, max_cz + 1):
+                yield from self._cells.get((cx, cz), ())
+
+    def indices_within(self, center: Dict[str, float], radius: float) -> List[int]:
+        radius_sq = radius * radius
+        positions = self.positions
+        found = [
+            idx
+            for idx in self._cells_around(center, radius)
+            if squared_distance(positions[idx], center) <= radius_sq
+        ]
+        found.sort()
+        return found
+
+    def index_of(self, position: Dict[str, float], tolerance: float = REACHABLE_GRID_STEP / 2) -> int | None:
+        """`tolerance` 안에서 가장 가까운 reachable 위치의 인덱스 (없으면 None)"""
+        best = None
+        best_sq = tolerance * tolerance
+        for idx in self.indices_within(position, tolerance):
+            dist_sq = squared_distance(self.positions[idx], position)
+            if dist_sq <= best_sq:
+                best, best_sq = idx, dist_sq
+        return best
+
+    def _build_neighbors(self) -> List[List[Tuple[int, float]]]:
+        """대각선 한 칸 이내 쌍을 잇는 8방향 인접 리스트. 넓은 축으로 정렬해 k칸 앞과의 쌍을 numpy로 한 번에 비교한다."""
+        count = len(self.positions)
+        if not count:
+            return []
+        radius = REACHABLE_GRID_STEP * math.sqrt(2.0) + 1e-3
+        radius_sq = radius * radius
+        axis = int(np.argmax(np.ptp(self._xz, axis=0)))
+        order = np.argsort(self._xz[:, axis], kind="stable")
+        along, across = self._xz[order, axis], self._xz[order, 1 - axis]
+        sources: List[np.ndarray] = []
+        targets: List[np.ndarray] = []
+        for k in range(1, count):
+            d_along = along[k:] - along[:-k]
+            in_band = d_along <= radius
+            if not in_band.any():
+                break
+            d_across = across[k:] - across[:-k]
+            hits = np.flatnonzero(in_band & (d_along * d_along + d_across * d_across <= radius_sq))
+            first, second = order[hits], order[hits + k]
+            sources += [first, second]
+            targets += [second, first]
+        if not sources:
+            return [[] for _ in range(count)]
+
+        src, dst = np.concatenate(sources), np.concatenate(targets)
+        # 위치별 반경 질의와 같은 (source, neighbour) 오름차순.
+        ranked = np.lexsort((dst, src))
+        src, dst = src[ranked], dst[ranked]
+        delta = self._xz[src] - self._xz[dst]
+        pairs = list(zip(dst.tolist(), np.hypot(delta[:, 0], delta[:, 1]).tolist()))
+        bounds = np.searchsorted(src, np.arange(count + 1)).tolist()
+        return [pairs[bounds[idx] : bounds[idx + 1]] for idx in range(count)]
+
+    def path_lengths_from(self, start: int) -> List[float]:
+        """`start`에서 모든 위치까지의 격자 최단 경로 길이 (끊겨 있으면 inf). 시작점마다 Dijkstra 한 번, 캐시."""
+        cached = self._path_lengths.get(start)
+        if cached is not None:
+            return cached
+        if self._neighbors is None:
+            self._neighbors = self._build_neighbors()
+
+        # 루프 안에서 전역/속성 조회를 피하도록 지역 변수로 묶는다.
+        heappop, heappush = heapq.heappop, heapq.heappush
+        neighbors = self._neighbors
+        lengths = [math.inf] * len(self.positions)
+        lengths[start] = 0.0
+        heap = [(0.0, start)]
+        while heap:
+            length, idx = heappop(heap)
+            if length > lengths[idx]:
+                continue
+            for other, step in neighbors[idx]:
+                candidate = length + step
+                if candidate < lengths[other]:
+                    lengths[other] = candidate
+                    heappush(heap, (candidate, other))
+        self._path_lengths[start] = lengths
+        return lengths
+
+    def _squared_distances(self, center: Dict[str, float]) -> np.ndarray:
+        return ((self._xz - (center["x"], center["z"])) ** 2).sum(axis=1)
+
+    def indices_near_any(self, centers: Sequence[Dict[str, float]], radius: float) -> Set[int]:
+        """`centers` 중 하나와의 거리가 `radius` 미만인 인덱스. 각 center 주변 격자 칸만 훑는다."""
+        radius_sq = radius * radius
+        positions = self.positions
+        return {
+            idx
+            for center in centers
+            for idx in self._cells_around(center, radius)
+            if squared_distance(positions[idx], center) < radius_sq
+        }
+
+    def nearest_indices(self, center: Dict[str, float], k: int, exclude: Set[int] | None = None) -> List[int]:
+        if not self.positions:
+            return []
+        d2 = self._squared_distances(center)
+        if exclude:
+            d2[list(exclude)] = np.inf
+        if k <= 0:
+            return []
+        if k < len(d2):
+            # k번째 거리까지 O(N)으로 고른 뒤 (거리, 인덱스)로 정렬: stable argsort 앞 k개와 같다.
+            kth = np.partition(d2, k - 1)[k - 1]
+            selected = np.flatnonzero(d2 <= kth)
+            order = selected[np.lexsort((selected, d2[selected]))][:k]
+        else:
+            order = np.argsort(d2, kind="stable")
+        return [idx for idx in order.tolist() if np.isfinite(d2[idx])]
+
+    def nearest(self, center: Dict[str, float], k: int, exclude: Set[int] | None = None) -> List[Dict[str, float]]:
+        return [self.positions[idx] for idx in self.nearest_indices(center, k, exclude)]
+
+    def headings_to(self, indices: Sequence[int], target: Dict[str, float]) -> List[float]:
+        """각 인덱스의 calculate_angle(positions[idx], target)을 arctan2 한 번으로"""
+        if not indices:
+            return []
+        delta = (target["x"], target["z"]) - self._xz[list(indices)]
+        return np.degrees(np.arctan2(delta[:, 0], delta[:, 1])).tolist()
 
 
 def _dedupe_poses(poses: Sequence[Dict[str, float]], current_rotation: float, current_horizon: float) -> List[Dict[str, float]]:
@@ -118,11 +311,13 @@ def _dedupe_poses(poses: Sequence[Dict[str, float]], current_rotation: float, cu
     return [row[1] for row in best_by_position.values()]
 
 
-def _pose_distance_to_object(pose: Dict[str, float], obj_pos: Dict[str, float]) -> float:
-    return calculate_distance(
-        obj_pos,
-        {"x": float(pose["x"]), "y": float(pose["y"]), "z": float(pose["z"])},
-    )
+def _closest_poses(poses: Sequence[Dict[str, float]], obj_pos: Dict[str, float], limit: int) -> List[Dict[str, float]]:
+    """`poses`를 물체까지의 거리순으로 정렬해 앞의 `limit`개. 제곱 거리를 한 번에 계산하고 stable 정렬한다."""
+    if not poses:
+        return []
+    xz = np.array([(float(pose["x"]), float(pose["z"])) for pose in poses], dtype=np.float64)
+    d2 = ((xz - (obj_pos["x"], obj_pos["z"])) ** 2).sum(axis=1)
+    return [poses[idx] for idx in np.argsort(d2, kind="stable")[:limit].tolist()]
 
 
 def _should_enforce_strict_distance(
@@ -139,12 +334,12 @@ def _should_enforce_strict_distance(
         if str(pose.get("pose_source", "interactable")) == "interactable"
     ]
     poses_for_check = interactable_poses or list(candidate_poses)
-    closest_pose_distance = min(_pose_distance_to_object(pose, obj_pos) for pose in poses_for_check)
-    return closest_pose_distance <= max_distance + STRICT_DISTANCE_GEOMETRY_MARGIN
+    closest_pose_sq = min(squared_distance(pose, obj_pos) for pose in poses_for_check)
+    return closest_pose_sq <= (max_distance + STRICT_DISTANCE_GEOMETRY_MARGIN) ** 2
 
 
 def _query_interactable_poses(controller, agent_id, obj_id, positions):
-    step_kwargs = _step_kwargs(agent_id)
+    step_kwargs = _query_step_kwargs(agent_id)
     event = controller.step(
         action="GetInteractablePoses",
         objectId=obj_id,
@@ -164,100 +359,121 @@ def _candidate_poses(
     agent_id,
     obj_id,
     obj_pos,
-    reachable_positions,
+    reachable_grid: ReachableGrid,
     agent_clearance: float = AGENT_CLEARANCE,
 ) -> List[Dict[str, float]]:
     metadata = _get_metadata(controller, agent_id)
+    current_pos = metadata["agent"]["position"]
     current_rotation = metadata["agent"]["rotation"]["y"]
     current_horizon = metadata["agent"].get("cameraHorizon", 0)
     other_positions = _other_agent_positions(controller, agent_id)
 
-    filtered_positions = [
-        pos for pos in reachable_positions if _min_clearance(pos, other_positions) >= agent_clearance
-    ]
+    reachable_positions = reachable_grid.positions
+    blocked = reachable_grid.indices_near_any(other_positions, agent_clearance)
+    if blocked:
+        # 막힌 칸은 boolean mask로 한 번에 지우고, 남은 인덱스만 모은다.
+        keep = np.ones(len(reachable_positions), dtype=bool)
+        keep[list(blocked)] = False
+        filtered_positions = [reachable_positions[idx] for idx in np.flatnonzero(keep).tolist()]
+    else:
+        filtered_positions = reachable_positions
     poses = _query_interactable_poses(
         controller,
         agent_id,
         obj_id,
         filtered_positions or reachable_positions,
     )
-    if not poses and filtered_positions:
+    # 아무것도 막히지 않았다면 같은 질의를 반복할 이유가 없다.
+    if not poses and blocked and filtered_positions:
         poses = _query_interactable_poses(controller, agent_id, obj_id, reachable_positions)
     fallback_poses = _fallback_candidate_poses(
         obj_pos=obj_pos,
-        reachable_positions=filtered_positions or reachable_positions,
+        reachable_grid=reachable_grid,
         current_rotation=current_rotation,
         current_horizon=current_horizon,
+        exclude=blocked if filtered_positions else None,
     )
     if not poses:
         return fallback_poses
 
-    unique_poses = _dedupe_poses(poses, current_rotation, current_horizon)
-    unique_poses.sort(
-        key=lambda pose: _pose_distance_to_object(pose, obj_pos)
-    )
+    unique_poses = _closest_poses(_dedupe_poses(poses, current_rotation, current_horizon), obj_pos, 48)
     scored = []
-    step_kwargs = _step_kwargs(agent_id)
+    query_kwargs = _query_step_kwargs(agent_id)
+
+    # 경로 길이는 reachable 그래프에서 한 번에 구하고, 그래프에서 닿지 않는 pose만 시뮬레이터에 묻는다.
+    start_idx = reachable_grid.index_of(current_pos)
+    grid_lengths = reachable_grid.path_lengths_from(start_idx) if start_idx is not None else None
+    start_offset = (
+        calculate_distance(current_pos, reachable_grid.positions[start_idx]) if start_idx is not None else 0.0
+    )
 
-    for pose in unique_poses[:48]:
+    cutoff = math.inf
+    for pose in unique_poses:
+        # unique_poses는 물체까지 거리순이다. 앞의 POSE_ATTEMPTS개보다 확실히 먼 pose는
+        # 시도 순위에 들 수 없으므로, 경로 길이(시뮬레이터 질의)를 구하지 않고 멈춘다.
+        distance = calculate_distance(obj_pos, pose)
+        if distance > cutoff:
+            break
         pose = dict(pose)
         pose["pose_source"] = "interactable"
         target_pos = {"x": pose["x"], "y": pose["y"], "z": pose["z"]}
-        path_event = controller.step(action="GetShortestPathToPoint", target=target_pos, **step_kwargs)
-        if not _last_action_success(path_event, agent_id):
-            continue
-        corners = (_action_return(path_event, agent_id) or {}).get("corners") or []
-        scored.append(
-            (
-                calculate_distance(obj_pos, target_pos),
-                path_length(corners),
-                -_min_clearance(target_pos, other_positions),
-                pose,
-            )
-        )
+        goal_idx = reachable_grid.index_of(target_pos) if grid_lengths is not None else None
+        if goal_idx is not None and math.isfinite(grid_lengths[goal_idx]):
+            pose_path_length = start_offset + grid_lengths[goal_idx]
+        else:
+            path_event = controller.step(action="GetShortestPathToPoint", target=target_pos, **query_kwargs)
+            if not _last_action_success(path_event, agent_id):
+                continue
+            corners = (_action_return(path_event, agent_id) or {}).get("corners") or []
+            pose_path_length = path_length(corners)
+        scored.append((distance, pose_path_length, -_min_clearance(target_pos, other_positions), pose))
+        if len(scored) == POSE_ATTEMPTS:
+            cutoff = max(row[0] for row in scored)
 
     scored.sort(key=lambda row: row[:3])
     ranked = [row[3] for row in scored]
-    if fallback_poses:
-        ranked.extend(
-            pose
-            for pose in fallback_poses
-            if not any(
-                round(pose["x"], 2) == round(existing["x"], 2)
-                and round(pose["z"], 2) == round(existing["z"], 2)
-                for existing in ranked
-            )
-        )
+    # 이미 뽑힌 칸은 반올림 좌표 set으로 한 번만 기록해, fallback 하나당 ranked 전체를 훑지 않는다.
+    taken = {_rounded_xz(pose) for pose in ranked}
+    for pose in fallback_poses:
+        key = _rounded_xz(pose)
+        if key not in taken:
+            taken.add(key)
+            ranked.append(pose)
     return ranked
 
 
+def _rounded_xz(pose: Dict[str, float]) -> Tuple[float, float]:
+    return (round(pose["x"], 2), round(pose["z"], 2))
+
+
 def _fallback_candidate_poses(
     obj_pos: Dict[str, float],
-    reachable_positions: Sequence[Dict[str, float]],
+    reachable_grid: ReachableGrid,
     current_rotation: float,
     current_horizon: float,
+    exclude: Set[int] | None = None,
 ) -> List[Dict[str, float]]:
-    if not reachable_positions:
+    if not reachable_grid.positions:
         return []
 
-    nearby_positions = [
-        pos
-        for pos in reachable_positions
-        if calculate_distance(pos, obj_pos) <= FALLBACK_POSE_RADIUS
+    exclude = exclude or set()
+    nearby_indices = [
+        idx
+        for idx in reachable_grid.indices_within(obj_pos, FALLBACK_POSE_RADIUS)
+        if idx not in exclude
     ]
-    candidate_positions = nearby_positions or sorted(
-        reachable_positions,
-        key=lambda pos: calculate_distance(pos, obj_pos),
-    )[:12]
+    candidate_indices = (nearby_indices or reachable_grid.nearest_indices(obj_pos, 12, exclude))[:12]
+    headings = reachable_grid.headings_to(candidate_indices, obj_pos)
 
     poses: List[Dict[str, float]] = []
-    for pos in candidate_positions[:12]:
+    for idx, heading in zip(candidate_indices, headings):
+        pos = reachable_grid.positions[idx]
         poses.append(
             {
                 "x": float(pos["x"]),
                 "y": float(pos["y"]),
                 "z": float(pos["z"]),
-                "rotation": float(calculate_angle(pos, obj_pos)),
+                "rotation": heading,
                 "horizon": 0.0,
                 "standing": True,
                 "pose_source": "fallback",
@@ -282,55 +498,100 @@ def _align_to_pose_iter(
     target_horizon,
     capture_callback,
 ) -> Generator[ActionResult, None, None]:
+    """
+    도착 후 목표 yaw/horizon으로 정렬.
+    둘 다 틀어져 있으면 Teleport(rotation, horizon) 한 번으로 절대값을 맞추고, 실패할 때만 Rotate/Look으로 나눠 보낸다.
+    """
     step_kwargs = _step_kwargs(agent_id)
-    metadata = _get_metadata(controller, agent_id)
-    current_rotation = metadata["agent"]["rotation"]["y"]
+    agent = _get_metadata(controller, agent_id)["agent"]
+
+    angle_diff = normalize_angle(float(target_rotation) - agent["rotation"]["y"]) if target_rotation is not None else 0.0
+    horizon_diff = float(target_horizon) - agent.get("cameraHorizon", 0) if target_horizon is not None else 0.0
+    needs_rotate = abs(angle_diff) > 5
+    needs_look = abs(horizon_diff) > 1
+
+    if needs_rotate and needs_look:
+        event = controller.step(
+            action="Teleport",
+            rotation=dict(x=0, y=float(target_rotation), z=0),
+            horizon=float(target_horizon),
+            **step_kwargs,
+        )
+        _capture(capture_callback, event)
+        if _last_action_success(event, agent_id):
+            yield _progress("align:teleport")
+            return
 
-    if target_rotation is not None:
-        angle_diff = normalize_angle(float(target_rotation) - current_rotation)
-        if abs(angle_diff) > 5:
-            rotate_action = "RotateRight" if angle_diff > 0 else "RotateLeft"
-            event = controller.step(action=rotate_action, degrees=abs(angle_diff), **step_kwargs)
-            _capture(capture_callback, event)
-            yield _progress(f"align:{rotate_action.lower()}")
-
-    if target_horizon is not None:
-        metadata = _get_metadata(controller, agent_id)
-        current_horizon = metadata["agent"].get("cameraHorizon", 0)
-        horizon_diff = float(target_horizon) - current_horizon
-        if abs(horizon_diff) > 1:
-            look_action = "LookDown" if horizon_diff > 0 else "LookUp"
-            event = controller.step(action=look_action, degrees=abs(horizon_diff), **step_kwargs)
-            _capture(capture_callback, event)
-            yield _progress(f"align:{look_action.lower()}")
+    if needs_rotate:
+        rotate_action = "RotateRight" if angle_diff > 0 else "RotateLeft"
+        event = controller.step(action=rotate_action, degrees=abs(angle_diff), **step_kwargs)
+        _capture(capture_callback, event)
+        yield _progress(f"align:{rotate_action.lower()}")
 
+    if needs_look:
+        look_action = "LookDown" if horizon_diff > 0 else "LookUp"
+        event = controller.step(action=look_action, degrees=abs(horizon_diff), **step_kwargs)
+        _capture(capture_callback, event)
+        yield _progress(f"align:{look_action.lower()}")
 
-def _visibility_sweep_iter(controller, agent_id, object_type, capture_callback) -> Generator[ActionResult, None, bool]:
-    metadata = _get_metadata(controller, agent_id)
-    step_kwargs = _step_kwargs(agent_id)
 
-    print("  👀 수직 탐색")
-    if check_visible(metadata, object_type):
-        print("  ✓ 발견 (정면)")
-        return True
+def _visibility_sweep_order(metadata, target_pos) -> Tuple[int, int]:
+    """물체가 카메라보다 위에 있으면 위쪽부터 본다 (첫 스텝에서 찾을 확률을 높임). horizon은 아래가 +."""
+    camera_y = (metadata.get("cameraPosition") or {}).get("y")
+    if target_pos is not None and camera_y is not None and target_pos["y"] > camera_y:
+        return -1, 1
+    return 1, -1
 
-    event = controller.step(action="LookDown", degrees=30, **step_kwargs)
-    _capture(capture_callback, event)
-    yield _progress("visibility:look_down")
-    if check_visible(_get_metadata(controller, agent_id), object_type):
-        print("  ✓ 발견 (아래)")
-        return True
 
-    event = controller.step(action="LookUp", degrees=60, **step_kwargs)
+def _visibility_sweep_horizons(start_horizon: float, directions: Tuple[int, int]) -> List[float]:
+    """시작 horizon ± VISIBILITY_SWEEP_DEGREES 중 카메라 한계 안에서 실제로 달라지는 값만."""
+    horizons: List[float] = []
+    for direction in directions:
+        horizon = start_horizon + direction * VISIBILITY_SWEEP_DEGREES
+        horizon = min(MAX_CAMERA_HORIZON, max(MIN_CAMERA_HORIZON, horizon))
+        if abs(horizon - start_horizon) > 1 and horizon not in horizons:
+            horizons.append(horizon)
+    return horizons
+
+
+def _look_iter(controller, agent_id, from_horizon, to_horizon, capture_callback, label_suffix=""):
+    look_action = "LookDown" if to_horizon > from_horizon else "LookUp"
+    event = controller.step(action=look_action, degrees=abs(to_horizon - from_horizon), **_step_kwargs(agent_id))
     _capture(capture_callback, event)
-    yield _progress("visibility:look_up")
-    if check_visible(_get_metadata(controller, agent_id), object_type):
-        print("  ✓ 발견 (위)")
+    yield _progress(f"visibility:{'look_down' if look_action == 'LookDown' else 'look_up'}{label_suffix}")
+
+
+def _visibility_sweep_iter(
+    controller,
+    agent_id,
+    candidate_ids,
+    capture_callback,
+    target_pos=None,
+    reset_horizon: bool = True,
+) -> Generator[ActionResult, None, bool]:
+    """
+    정면 → 물체 쪽 → 반대쪽 순으로 시야를 확인한다.
+    현재 horizon을 직접 추적해 목표 horizon까지 한 번의 Look으로 이동하고, 카메라 한계에 막히는 Look은 생략한다.
+    reset_horizon=False면 실패 후 시선 복귀를 생략한다 (다음 pose 이동이 horizon을 다시 맞추므로).
+    """
+    metadata = _get_metadata(controller, agent_id)
+    start_horizon = float((metadata.get("agent") or {}).get("cameraHorizon", 0))
+
+    logger.debug("수직 탐색: %s", sorted(candidate_ids))
+    if check_visible_ids(metadata, candidate_ids):
+        logger.debug("발견 (정면)")
         return True
 
-    event = controller.step(action="LookDown", degrees=30, **step_kwargs)
-    _capture(capture_callback, event)
-    yield _progress("visibility:look_down_reset")
+    current_horizon = start_horizon
+    for horizon in _visibility_sweep_horizons(start_horizon, _visibility_sweep_order(metadata, target_pos)):
+        yield from _look_iter(controller, agent_id, current_horizon, horizon, capture_callback)
+        current_horizon = horizon
+        if check_visible_ids(_get_metadata(controller, agent_id), candidate_ids):
+            logger.debug("발견 (horizon %.0f)", horizon)
+            return True
+
+    if reset_horizon and current_horizon != start_horizon:
+        yield from _look_iter(controller, agent_id, current_horizon, start_horizon, capture_callback, "_reset")
     return False
 
 
@@ -414,7 +675,7 @@ def try_reach_pose_iter(
     _capture(capture_callback, teleport_event)
     if _last_action_success(teleport_event, agent_id):
         yield _progress("move:teleportfull")
-        print("    ✓ 도착 (TeleportFull)")
+        logger.debug("도착 (TeleportFull)")
         return True
 
     yield _progress("move:teleportfull:blocked")
@@ -431,11 +692,12 @@ def try_reach_pose_iter(
     )
 
 
-def _within_interaction_distance(metadata, object_id, max_distance: float | None) -> bool:
+def _within_interaction_distance(metadata, object_id, max_distance: float | None, index_hint: int | None = None) -> bool:
     if max_distance is None:
         return True
 
-    for obj in metadata.get("objects", []):
+    hinted = _objects_at(metadata.get("objects", []), {object_id: index_hint}) if index_hint is not None else None
+    for obj in hinted or metadata.get("objects", []):
         if obj.get("objectId") != object_id or not obj.get("visible"):
             continue
         distance = obj.get("distance")
@@ -453,47 +715,69 @@ def navigate_to_object_iter(
     max_distance: float | None = None,
     agent_clearance: float = AGENT_CLEARANCE,
     strict_max_distance: bool = False,
+    reachable_positions: Sequence[Dict[str, float]] | ReachableGrid | None = None,
+    candidate_ids: Dict[str, int] | None = None,
 ) -> Generator[ActionResult, None, bool]:
     """
     객체까지 이동하여 상호작용 준비.
     Primitive action마다 ActionResult를 yield하므로 상위 executor가 다른 agent와 interleave할 수 있다.
+    reachable_positions(목록 또는 미리 만든 ReachableGrid)를 넘기면 GetReachablePositions 재조회를 생략한다.
+    candidate_ids({objectId: index}, 호출자의 타입별 인덱스)를 넘기면 전체 objects 스캔을 생략한다.
     """
-    print(f"\n🎯 객체 네비게이션: {object_type}")
+    logger.info("객체 네비게이션: %s", object_type)
 
     get_metadata = lambda: _get_metadata(controller, agent_id)
 
     all_objects = get_metadata()['objects']
-    target_objects = [obj for obj in all_objects if obj['objectType'] == object_type]
+    # THOR는 스텝 사이에 objects 순서를 유지하므로, 후보의 위치를 기억해 두면 매 확인이 O(1)이다.
+    target_objects = _objects_at(all_objects, candidate_ids) if candidate_ids else None
+    if target_objects is None:
+        candidate_ids = {obj['objectId']: idx for idx, obj in enumerate(all_objects) if obj['objectType'] == object_type}
+        target_objects = [all_objects[idx] for idx in candidate_ids.values()]
 
     if not target_objects:
-        print(f"  ❌ {object_type} 없음")
+        logger.info("%s 없음", object_type)
         yield _failure(f"navigate:{object_type}:missing")
         return False
 
     current_pos = get_metadata()['agent']['position']
-    target_obj = min(target_objects, key=lambda obj: calculate_distance(current_pos, obj['position']))
+    target_obj = min(target_objects, key=lambda obj: squared_distance(current_pos, obj['position']))
     obj_id = target_obj['objectId']
     obj_pos = target_obj['position']
-    print(f"  📍 목표: {obj_id}")
+    logger.info("목표: %s", obj_id)
+
+    # 이미 현재 자세에서 보이고 상호작용 거리 안이면 pose 탐색/이동/시야 스윕을 전부 건너뛴다.
+    target_hint = {obj_id: candidate_ids[obj_id]}
+    metadata = get_metadata()
+    if check_visible_ids(metadata, target_hint) and _within_interaction_distance(metadata, obj_id, max_distance, target_hint[obj_id]):
+        logger.info("이미 시야 안 (이동 생략)")
+        yield _progress(f"navigate:{object_type}:already_visible", transitions=0)
+        return True
 
-    reach_event = controller.step(action='GetReachablePositions', **_step_kwargs(agent_id))
-    if not _last_action_success(reach_event, agent_id):
-        print(f"  ❌ GetReachablePositions 실패")
-        yield _failure(f"navigate:{object_type}:reachable_positions_failed")
-        return False
+    if reachable_positions is None:
+        reach_event = controller.step(action='GetReachablePositions', **_query_step_kwargs(agent_id))
+        if not _last_action_success(reach_event, agent_id):
+            logger.info("GetReachablePositions 실패")
+            yield _failure(f"navigate:{object_type}:reachable_positions_failed")
+            return False
 
-    reachable_positions = _action_return(reach_event, agent_id) or []
+        reachable_positions = _action_return(reach_event, agent_id) or []
 
+    reachable_grid = (
+        reachable_positions
+        if isinstance(reachable_positions, ReachableGrid)
+        else ReachableGrid(reachable_positions)
+    )
     candidate_poses = _candidate_poses(
         controller,
         agent_id,
         obj_id,
         obj_pos,
-        reachable_positions,
+        reachable_grid,
         agent_clearance=agent_clearance,
     )
     if not candidate_poses:
-        print(f"  ❌ 상호작용 가능한 pose를 찾지 못함")
+        logger.info("상호작용 가능한 pose를 찾지 못함")
         yield _failure(f"navigate:{object_type}:no_interactable_pose")
         return False
 
@@ -503,8 +787,9 @@ def navigate_to_object_iter(
         max_distance,
     )
 
-    for i, pose in enumerate(candidate_poses[:5]):
-        print(f"  📍 시도 {i+1}/{min(len(candidate_poses), 5)}: ({pose['x']:.2f}, {pose['z']:.2f})")
+    attempt_count = min(len(candidate_poses), POSE_ATTEMPTS)
+    for i, pose in enumerate(candidate_poses[:POSE_ATTEMPTS]):
+        logger.debug("시도 %d/%d: (%.2f, %.2f)", i + 1, attempt_count, pose["x"], pose["z"])
         reached = yield from try_reach_pose_iter(
             controller,
             agent_id,
@@ -513,29 +798,38 @@ def navigate_to_object_iter(
             max_steps=120,
         )
         if not reached:
-            print(f"  ⚠️ 시도 {i+1} 실패, 다음 목표 시도")
+            logger.debug("시도 %d 실패, 다음 목표 시도", i + 1)
             continue
 
-        visible = yield from _visibility_sweep_iter(controller, agent_id, object_type, capture_callback)
+        visible = yield from _visibility_sweep_iter(
+            controller,
+            agent_id,
+            candidate_ids,
+            capture_callback,
+            target_pos=obj_pos,
+            reset_horizon=i == attempt_count - 1,
+        )
         pose_source = str(pose.get("pose_source", "interactable"))
-        within_distance = _within_interaction_distance(get_metadata(), obj_id, max_distance)
+        within_distance = _within_interaction_distance(get_metadata(), obj_id, max_distance, candidate_ids[obj_id])
         if visible and (
             max_distance is None
             or within_distance
             or (pose_source == "interactable" and not effective_strict_max_distance)
         ):
             return True
-        if visible and max_distance is not None:
-            actual_obj = next((obj for obj in get_metadata()["objects"] if obj.get("objectId") == obj_id), None)
+        if visible and max_distance is not None and logger.isEnabledFor(logging.DEBUG):
+            objects = get_metadata()["objects"]
+            hinted = _objects_at(objects, {obj_id: candidate_ids[obj_id]})
+            actual_obj = hinted[0] if hinted else next((obj for obj in objects if obj.get("objectId") == obj_id), None)
             actual_distance = actual_obj.get("distance") if actual_obj is not None else None
             if actual_distance is not None:
-                print(f"  ⚠️ 상호작용 거리 초과 ({float(actual_distance):.2f}m > {max_distance:.2f}m)")
+                logger.debug("상호작용 거리 초과 (%.2fm > %.2fm)", float(actual_distance), max_distance)
             else:
-                print(f"  ⚠️ 상호작용 거리 초과")
+                logger.debug("상호작용 거리 초과")
 
-        print(f"  ⚠️ 시도 {i+1} 실패, 다음 목표 시도")
+        logger.debug("시도 %d 실패, 다음 목표 시도", i + 1)
 
-    print(f"  ❌ 모든 목표 위치 도달 실패")
+    logger.info("모든 목표 위치 도달 실패")
     yield _failure(f"navigate:{object_type}:unreachable")
     return False
 
@@ -548,6 +842,8 @@ def navigate_to_object(
     max_distance: float | None = None,
     agent_clearance: float = AGENT_CLEARANCE,
     strict_max_distance: bool = False,
+    reachable_positions: Sequence[Dict[str, float]] | ReachableGrid | None = None,
+    candidate_ids: Dict[str, int] | None = None,
 ):
     success = True
     for result in navigate_to_object_iter(
@@ -558,6 +854,8 @@ def navigate_to_object(
         max_distance=max_distance,
         agent_clearance=agent_clearance,
         strict_max_distance=strict_max_distance,
+        reachable_positions=reachable_positions,
+        candidate_ids=candidate_ids,
     ):
         success = result.success
         if not result.success:
@@ -576,24 +874,28 @@ def try_reach_position_iter(
 ) -> Generator[ActionResult, None, bool]:
     get_metadata = lambda: _get_metadata(controller, agent_id)
     step_kwargs = _step_kwargs(agent_id)
+    query_kwargs = _query_step_kwargs(agent_id)
 
-    initial_pos = get_metadata()['agent']['position']
-    initial_dist = calculate_distance(initial_pos, target_pos)
-    print(f"    🚶 이동 시작: {initial_dist:.2f}m")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("이동 시작: %.2fm", calculate_distance(get_metadata()['agent']['position'], target_pos))
 
     path = []
     path_index = 0
     steps = 0
     stuck_streak = 0
+    # agent 메타데이터는 이 agent가 스텝을 밟은 뒤에만 다시 읽는다.
+    agent = None
 
     while steps < max_steps:
-        current_pos = get_metadata()['agent']['position']
-        final_dist = calculate_distance(current_pos, target_pos)
-        if final_dist <= ARRIVAL_TOLERANCE:
+        if agent is None:
+            agent = get_metadata()['agent']
+        current_pos = agent['position']
+        final_sq = squared_distance(current_pos, target_pos)
+        if final_sq <= ARRIVAL_TOLERANCE_SQ:
             break
 
         if not path or path_index >= len(path):
-            path_event = controller.step(action='GetShortestPathToPoint', target=target_pos, **step_kwargs)
+            path_event = controller.step(action='GetShortestPathToPoint', target=target_pos, **query_kwargs)
             if not _last_action_success(path_event, agent_id):
                 return False
 
@@ -602,39 +904,42 @@ def try_reach_position_iter(
                 return False
 
             path_index = 1 if len(path) > 1 else 0
-            print(f"    🗺️ 경로: {len(path)}개 웨이포인트")
+            logger.debug("경로: %d개 웨이포인트", len(path))
 
         if path_index >= len(path):
             continue
 
         waypoint = path[path_index]
-        waypoint_dist = calculate_distance(current_pos, waypoint)
-        if waypoint_dist <= WAYPOINT_TOLERANCE:
+        waypoint_sq = squared_distance(current_pos, waypoint)
+        if waypoint_sq <= WAYPOINT_TOLERANCE_SQ:
             path_index += 1
             continue
 
-        current_rot = get_metadata()['agent']['rotation']['y']
-        target_angle = calculate_angle(current_pos, waypoint)
-        angle_diff = normalize_angle(target_angle - current_rot)
+        angle_diff = heading_error(current_pos, waypoint, agent['rotation']['y'])
 
         if abs(angle_diff) > 12:
             rotate_action = 'RotateRight' if angle_diff > 0 else 'RotateLeft'
             event = controller.step(action=rotate_action, degrees=min(20, abs(angle_diff)), **step_kwargs)
             _capture(capture_callback, event)
             steps += 1
+            agent = None
             yield _progress(f"move:{rotate_action.lower()}")
             continue
 
-        move_magnitude = min(0.25, max(0.1, min(final_dist, waypoint_dist)))
+        # 남은 거리가 최대 보폭 이상이면(대부분의 스텝) sqrt 없이 제곱끼리 비교로 끝낸다.
+        remaining_sq = min(final_sq, waypoint_sq)
+        move_magnitude = MAX_MOVE_MAGNITUDE if remaining_sq >= MAX_MOVE_MAGNITUDE_SQ else max(0.1, sqrt(remaining_sq))
         move_result = controller.step(action='MoveAhead', moveMagnitude=move_magnitude, **step_kwargs)
         _capture(capture_callback, move_result)
         steps += 1
 
-        new_pos = get_metadata()['agent']['position']
-        moved_dist = calculate_distance(current_pos, new_pos)
-        new_final_dist = calculate_distance(new_pos, target_pos)
+        # MoveAhead가 돌려준 이벤트에서 바로 읽는다 (last_event를 다시 거치지 않음).
+        agent = _event_metadata(move_result, agent_id).get('agent') or get_metadata()['agent']
+        new_pos = agent['position']
+        moved_sq = squared_distance(current_pos, new_pos)
+        new_final_sq = squared_distance(new_pos, target_pos)
 
-        if _last_action_success(move_result, agent_id) and moved_dist > 0.02 and new_final_dist < final_dist:
+        if _last_action_success(move_result, agent_id) and moved_sq > MIN_PROGRESS_SQ and new_final_sq < final_sq:
             stuck_streak = 0
             yield _progress("move:ahead")
             continue
@@ -652,6 +957,7 @@ def try_reach_position_iter(
             capture_callback,
         )
         steps += len(_recovery_plan(angle_diff, stuck_streak))
+        agent = None
         if not recovered and stuck_streak >= 4:
             return False
 
@@ -660,10 +966,10 @@ def try_reach_position_iter(
 
     if final_dist <= ARRIVAL_TOLERANCE:
         yield from _align_to_pose_iter(controller, agent_id, target_rotation, target_horizon, capture_callback)
-        print(f"    ✓ 도착 (거리 {final_dist:.2f}m)")
+        logger.debug("도착 (거리 %.2fm)", final_dist)
         return True
 
-    print(f"    ⚠️ 목표에서 멀리 떨어짐 (거리 {final_dist:.2f}m)")
+    logger.debug("목표에서 멀리 떨어짐 (거리 %.2fm)", final_dist)
     return False
 
 
@@ -671,3 +977,23 @@ def check_visible(metadata, object_type):
     """객체가 보이는지 확인"""
     return any(obj['visible'] and obj['objectType'] == object_type 
                for obj in metadata['objects'])
+
+
+def _objects_at(objects, object_index):
+    """{objectId: index} 위치의 객체들. 순서가 바뀌어 하나라도 어긋나면 None."""
+    found = []
+    for object_id, idx in object_index.items():
+        if idx >= len(objects) or objects[idx].get('objectId') != object_id:
+            return None
+        found.append(objects[idx])
+    return found
+
+
+def check_visible_ids(metadata, object_ids):
+    """objectId 집합 중 하나라도 보이는지 확인. {objectId: index} 매핑이면 그 위치만 먼저 본다."""
+    if isinstance(object_ids, dict):
+        hinted = _objects_at(metadata['objects'], object_ids)
+        if hinted is not None:
+            return any(obj['visible'] for obj in hinted)
+    return any(obj['visible'] and obj['objectId'] in object_ids
+               for obj in metadata['objects'])
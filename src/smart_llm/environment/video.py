@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import queue
+import subprocess
+import sys
+import threading
+from functools import lru_cache
+from typing import Any, FrozenSet, List, Optional
+
+import numpy as np
+
+# imageio-ffmpeg pipes frames to an ffmpeg subprocess, so encoding runs outside the
+# interpreter. Even-sized frames are converted to yuv420p with cv2 first (half the
+# bytes of rgb24, and ffmpeg skips its own conversion); odd sizes or a missing cv2
+# pipe raw rgb24. Any ffmpeg encoder name works, e.g. "h264_nvenc" to encode on the
+# GPU. "auto" picks the platform's hardware H.264 encoder when ffmpeg ships it.
+FFMPEG_CODEC = "auto"
+SOFTWARE_CODEC = "libx264"
+
+# Hardware H.264 encoders "auto" tries, in order, when ffmpeg lists them. Static ffmpeg
+# builds list NVENC even without an NVIDIA GPU/driver, so those are only picked after a
+# one-frame test encode succeeds. VAAPI/QSV need device setup and stay opt-in.
+PLATFORM_HARDWARE_CODECS = {
+    "darwin": ("h264_videotoolbox",),
+    "linux": ("h264_nvenc",),
+    "win32": ("h264_nvenc",),
+}
+PROBED_HARDWARE_CODECS = frozenset({"h264_nvenc"})
+
+# OpenCV fallback: H.264 via the FFMPEG backend first (libx264 / hardware encoders
+# when OpenCV's ffmpeg build exposes them), then the built-in MPEG-4 Part 2 encoder.
+VIDEO_CODECS = ("avc1", "mp4v")
+
+
+@lru_cache(maxsize=None)
+def _ffmpeg_encoders() -> FrozenSet[str]:
+    """Encoder names reported by the bundled ffmpeg (probed once per process)."""
+    try:
+        import imageio_ffmpeg
+
+        listing = subprocess.run(
+            [imageio_ffmpeg.get_ffmpeg_exe(), "-hide_banner", "-encoders"],
+            capture_output=True,
+            text=True,
+            timeout=10,
+        ).stdout
+    except Exception:
+        return frozenset()
+    return frozenset(parts[1] for parts in map(str.split, listing.splitlines()) if len(parts) > 1)
+
+
+@lru_cache(maxsize=None)
+def _encoder_works(codec: str) -> bool:
+    """Whether `codec` can encode one small frame here (probed once per process)."""
+    try:
+        import imageio_ffmpeg
+
+        result = subprocess.run(
+            [
+                imageio_ffmpeg.get_ffmpeg_exe(),
+                "-hide_banner",
+                "-loglevel",
+                "error",
+                "-f",
+                "lavfi",
+                "-i",
+                "color=black:size=256x256:rate=1",
+                "-frames:v",
+                "1",
+                "-pix_fmt",
+                "yuv420p",
+                "-c:v",
+                codec,
+                "-f",
+                "null",
+                "-",
+            ],
+            capture_output=True,
+            timeout=10,
+        )
+    except Exception:
+        return False
+    return result.returncode == 0
+
+
+def resolve_ffmpeg_codec(codec: str = FFMPEG_CODEC) -> str:
+    """Map "auto" to a working hardware H.264 encoder on this platform, else libx264."""
+    if codec != "auto":
+        return codec
+    encoders = _ffmpeg_encoders()
+    for candidate in PLATFORM_HARDWARE_CODECS.get(sys.platform, ()):
+        if candidate in encoders and (candidate not in PROBED_HARDWARE_CODECS or _encoder_works(candidate)):
+            return candidate
+    return SOFTWARE_CODEC
+
+
+class FFmpegPipeWriter:
+    """Stream RGB frames into an ffmpeg subprocess through imageio-ffmpeg.
+
+    Even-sized frames are converted to planar YUV 4:2:0 (BT.601 limited range, the
+    same conversion ffmpeg would apply) before they are piped, halving the bytes
+    sent per frame. Odd sizes, or a missing cv2, pipe rgb24 unchanged.
+    """
+
+    def __init__(self, path: str, width: int, height: int, fps: float, codec: str = FFMPEG_CODEC):
+        import imageio_ffmpeg
+
+        self._cv2 = None
+        if width % 2 == 0 and height % 2 == 0:
+            try:
+                import cv2
+            except ImportError:
+                cv2 = None
+            self._cv2 = cv2
+        self._last_rgb: Any = None
+        self._last_yuv: Any = None
+        self._gen = imageio_ffmpeg.write_frames(
+            path,
+            (width, height),
+            fps=fps,
+            codec=resolve_ffmpeg_codec(codec),
+            pix_fmt_in="yuv420p" if self._cv2 is not None else "rgb24",
+            macro_block_size=2,
+        )
+        self._gen.send(None)
+
+    def write(self, frame) -> None:
+        if frame is not self._last_rgb:
+            self._last_rgb = frame
+            if self._cv2 is not None:
+                # Convert into the same I420 buffer every frame instead of allocating.
+                self._last_yuv = self._cv2.cvtColor(frame, self._cv2.COLOR_RGB2YUV_I420, dst=self._last_yuv)
+            else:
+                self._last_yuv = frame
+        self._gen.send(self._last_yuv)
+
+    def release(self) -> None:
+        if self._gen is not None:
+            self._gen.close()
+            self._gen = None
+
+
+class OpenCVVideoWriter:
+    """cv2.VideoWriter that accepts RGB frames like FFmpegPipeWriter."""
+
+    def __init__(self, writer):
+        self._writer = writer
+        self._last_rgb: Any = None
+        self._last_bgr: Any = None
+
+    def prepare(self, frame, out=None):
+        """Convert an RGB frame into a private BGR buffer (reusing `out` if given)."""
+        import cv2
+
+        return cv2.cvtColor(frame, cv2.COLOR_RGB2BGR, dst=out)
+
+    def write(self, frame) -> None:
+        # Re-writing the previous frame object (unchanged views) skips the conversion;
+        # otherwise convert into the same BGR buffer instead of allocating per frame.
+        if frame is not self._last_rgb:
+            self._last_rgb = frame
+            dst = self._last_bgr if getattr(self._last_bgr, "shape", None) == getattr(frame, "shape", ()) else None
+            self._last_bgr = self.prepare(frame, dst)
+        self._writer.write(self._last_bgr)
+
+    def release(self) -> None:
+        self._writer.release()
+
+
+class ThreadedVideoWriter:
+    """Hand frames to a background thread so encoding never blocks the simulator loop.
+
+    The queue is bounded; when the encoder falls behind, `write` blocks instead of
+    dropping frames. Encoder errors are re-raised from `release`.
+
+    The simulator thread only copies each ndarray frame into a ring of preallocated
+    buffers; colour conversion and encoding both run on the worker thread (cv2 and the
+    ffmpeg pipe release the GIL). With `maxsize` queued frames plus one being encoded,
+    `maxsize + 2` slots guarantee a slot is never overwritten while the worker may
+    still read it.
+    """
+
+    def __init__(self, writer, maxsize: int = 8):
+        self._writer = writer
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=maxsize)
+        self._ring: List[Any] = []
+        self._frame_format: Optional[tuple] = None
+        self._ring_size = maxsize + 2
+        self._ring_index = 0
+        self._last_frame: Any = None
+        self._last_copy: Any = None
+        self._error: Optional[BaseException] = None
+        self._thread: Optional[threading.Thread] = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            frame = self._queue.get()
+            if frame is None:
+                return
+            if self._error is not None:
+                continue
+            try:
+                self._writer.write(frame)
+            except BaseException as exc:  # keep draining so producers never block forever
+                self._error = exc
+
+    def write(self, frame) -> None:
+        # AI2-THOR hands out a fresh, never-mutated array per event, so the same object
+        # means the same pixels. The copy only gives the worker a buffer the caller does
+        # not own; a repeated frame object (unchanged views) shares the previous copy, and
+        # the wrapped writer's own identity check then skips its conversion too.
+        if frame is not self._last_frame:
+            self._last_frame = frame
+            self._last_copy = self._copy(frame)
+        self._queue.put(self._last_copy)
+
+    def _copy(self, frame):
+        if not isinstance(frame, np.ndarray):
+            return frame.copy() if hasattr(frame, "copy") else frame
+        frame_format = (frame.shape, frame.dtype)
+        if self._frame_format is None:
+            self._frame_format = frame_format
+        elif frame_format != self._frame_format:
+            raise ValueError(f"frame shape changed from {self._frame_format[0]} to {frame.shape}")
+        if self._ring_index < len(self._ring):
+            slot = self._ring[self._ring_index]
+        else:
+            slot = np.empty_like(frame)
+            self._ring.append(slot)
+        np.copyto(slot, frame)
+        self._ring_index = (self._ring_index + 1) % self._ring_size
+        return slot
+
+    def release(self) -> None:
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        self._writer.release()
+        if self._error is not None:
+            raise RuntimeError("video encoding failed") from self._error
+
+
+def open_opencv_writer(path: str, width: int, height: int, fps: float) -> OpenCVVideoWriter:
+    import cv2
+
+    # NVENC can be selected without code changes via
+    # OPENCV_FFMPEG_WRITER_OPTIONS="video_codec;h264_nvenc". On macOS the AVFoundation
+    # backend encodes avc1 through VideoToolbox, so it is tried before FFMPEG.
+    backends = [cv2.CAP_FFMPEG]
+    if sys.platform == "darwin" and hasattr(cv2, "CAP_AVFOUNDATION"):
+        backends.insert(0, cv2.CAP_AVFOUNDATION)
+    writer = None
+    for codec in VIDEO_CODECS:
+        for backend in backends:
+            writer = cv2.VideoWriter(
+                path,
+                backend,
+                cv2.VideoWriter_fourcc(*codec),
+                fps,
+                (width, height),
+            )
+            if writer.isOpened():
+                return OpenCVVideoWriter(writer)
+            writer.release()
+    return OpenCVVideoWriter(writer)
+
+
+def open_video_writer(path: str, width: int, height: int, fps: float, codec: str = FFMPEG_CODEC):
+    """Open an mp4 writer for RGB frames, preferring the imageio-ffmpeg pipe."""
+    try:
+        return FFmpegPipeWriter(path, width, height, fps, codec=codec)
+    except Exception:
+        return open_opencv_writer(path, width, height, fps)
@@ -22,6 +22,26 @@ class ExecutionStep:
     required_skills: Tuple[str, ...]
 
 
+# Steps per task type, built once; ExecutionStep is frozen so every task shares them.
+EXECUTION_STEPS: Dict[str, Tuple[ExecutionStep, ...]] = {
+    "slice_and_store": (
+        ExecutionStep(name="prepare_source", required_skills=("navigate", "slice")),
+        ExecutionStep(name="transport_and_store", required_skills=("navigate", "pickup", "open_close", "place")),
+    ),
+    "heat_object": (
+        ExecutionStep(name="load_microwave", required_skills=("navigate", "pickup", "open_close", "place")),
+        ExecutionStep(name="activate_microwave", required_skills=("navigate", "toggle")),
+    ),
+    "clean_object": (
+        ExecutionStep(name="place_in_sink", required_skills=("navigate", "pickup", "place")),
+        ExecutionStep(name="toggle_faucet", required_skills=("navigate", "toggle")),
+    ),
+    "toggle_light": (ExecutionStep(name="navigate_and_toggle", required_skills=("navigate", "toggle")),),
+    "navigate": (ExecutionStep(name="navigate", required_skills=("navigate",)),),
+}
+DEFAULT_EXECUTION_STEPS: Tuple[ExecutionStep, ...] = (ExecutionStep(name="commit", required_skills=tuple()),)
+
+
 class InterleavingExecutor:
     def __init__(
         self,
@@ -197,27 +217,8 @@ class InterleavingExecutor:
                 f"{task.subtask_id}:{step.name}:{selected_robot}",
             )
 
-    def _execution_steps(self, task_type: str) -> List[ExecutionStep]:
-        if task_type == "slice_and_store":
-            return [
-                ExecutionStep(name="prepare_source", required_skills=("navigate", "slice")),
-                ExecutionStep(name="transport_and_store", required_skills=("navigate", "pickup", "open_close", "place")),
-            ]
-        if task_type == "heat_object":
-            return [
-                ExecutionStep(name="load_microwave", required_skills=("navigate", "pickup", "open_close", "place")),
-                ExecutionStep(name="activate_microwave", required_skills=("navigate", "toggle")),
-            ]
-        if task_type == "clean_object":
-            return [
-                ExecutionStep(name="place_in_sink", required_skills=("navigate", "pickup", "place")),
-                ExecutionStep(name="toggle_faucet", required_skills=("navigate", "toggle")),
-            ]
-        if task_type == "toggle_light":
-            return [ExecutionStep(name="navigate_and_toggle", required_skills=("navigate", "toggle"))]
-        if task_type == "navigate":
-            return [ExecutionStep(name="navigate", required_skills=("navigate",))]
-        return [ExecutionStep(name="commit", required_skills=tuple())]
+    def _execution_steps(self, task_type: str) -> Tuple[ExecutionStep, ...]:
+        return EXECUTION_STEPS.get(task_type, DEFAULT_EXECUTION_STEPS)
 
     def _select_robot_for_step(
         self,
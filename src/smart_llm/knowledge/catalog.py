@@ -3,12 +3,14 @@ from __future__ import annotations
 import json
 from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Iterable, List
+from typing import Any, Dict, Iterable, List, Tuple
 
 
 CATALOG_PATH = Path(__file__).resolve().parent / "ai2thor_world.yaml"
 
 
+# The catalog file is read once per process, so everything derived from it (alias
+# table, prompt sections) is memoized as well.
 @lru_cache(maxsize=1)
 def load_world_knowledge() -> Dict[str, Any]:
     """Load AI2-THOR world catalog from YAML(JSON-compatible) file."""
@@ -50,8 +52,8 @@ def task_type_to_skills_map() -> Dict[str, List[str]]:
     return out
 
 
-def alias_to_object_type() -> Dict[str, str]:
-    """Lower-cased alias/objectType lookup table for heuristic decomposition."""
+@lru_cache(maxsize=1)
+def _alias_pairs() -> Tuple[Tuple[str, str], ...]:
     lookup: Dict[str, str] = {}
     for row in load_world_knowledge().get("objects", []):
         obj_type = row.get("objectType")
@@ -60,9 +62,15 @@ def alias_to_object_type() -> Dict[str, str]:
         lookup[obj_type.lower()] = obj_type
         for alias in row.get("aliases", []):
             lookup[str(alias).lower()] = obj_type
-    return lookup
+    return tuple(lookup.items())
+
+
+def alias_to_object_type() -> Dict[str, str]:
+    """Lower-cased alias/objectType lookup table for heuristic decomposition."""
+    return dict(_alias_pairs())
 
 
+@lru_cache(maxsize=None)
 def format_scene_catalog() -> str:
     catalog = load_world_knowledge().get("scenes", {})
     lines = []
@@ -73,6 +81,7 @@ def format_scene_catalog() -> str:
     return "\n".join(lines)
 
 
+@lru_cache(maxsize=None)
 def format_object_catalog(max_count: int | None = 400) -> str:
     items = object_types()
     if max_count is not None:
@@ -80,6 +89,7 @@ def format_object_catalog(max_count: int | None = 400) -> str:
     return ", ".join(items)
 
 
+@lru_cache(maxsize=None)
 def format_interaction_catalog() -> str:
     lines = []
     for row in interactions():
@@ -93,7 +103,7 @@ def format_interaction_catalog() -> str:
 
 def infer_object_type_from_text(text: str, fallback: str = "") -> str:
     lowered = text.lower()
-    for alias, obj_type in alias_to_object_type().items():
+    for alias, obj_type in _alias_pairs():
         if alias and alias in lowered:
             return obj_type
     return fallback
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
+import itertools
 import json
 import os
 import re
+import threading
 import time
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
-from .parser import parse_json_robust
+from .parser import load_json, parse_json_robust
 
 
 @dataclass
@@ -17,25 +19,87 @@ class ModelResponse:
     prompt_tokens: int = 0
     completion_tokens: int = 0
     estimated_cost_usd: float = 0.0
+    # Prompt tokens served from the provider's prompt cache (OpenAI reports these).
+    cached_prompt_tokens: int = 0
+
+
+class _JsonObjectTracker:
+    """Brace depth of streamed JSON text, fed one fragment at a time.
+
+    Braces inside strings are ignored; `closed` turns True once the top-level object
+    that the text opens is complete.
+    """
+
+    def __init__(self):
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.closed = False
+
+    def feed(self, fragment: str) -> bool:
+        for ch in fragment:
+            if self.closed:
+                break
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == "\\":
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                self.in_string = True
+            elif ch == "{":
+                self.depth += 1
+            elif ch == "}" and self.depth:
+                self.depth -= 1
+                self.closed = self.depth == 0
+        return self.closed
 
 
 class BaseLLMAdapter:
     model_name: str
     allow_heuristic_fallback: bool = False
+    # Requests the backend serves side by side; None means no known limit.
+    max_concurrency: Optional[int] = None
+    # Whether generate_json can enforce a JSON schema during decoding.
+    supports_json_schema: bool = False
 
     def __init__(self):
-        self.last_response: Optional[ModelResponse] = None
+        # Requests may be issued from several threads at once (see
+        # SMARTPipeline.plan_many); each thread sees the response to its own call.
+        self._local = threading.local()
+
+    @property
+    def last_response(self) -> Optional[ModelResponse]:
+        return getattr(self._local, "response", None)
+
+    @last_response.setter
+    def last_response(self, response: Optional[ModelResponse]) -> None:
+        self._local.response = response
+
+    def _http(self):
+        """Per-thread requests.Session, so repeated calls reuse one keep-alive connection."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            import requests
+
+            session = self._local.session = requests.Session()
+        return session
 
     def generate_text(self, prompt: str) -> ModelResponse:
         raise NotImplementedError
 
-    def generate_json(self, prompt: str) -> Dict[str, Any]:
+    def generate_json(self, prompt: str, schema: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Parse a JSON reply; `schema` is enforced only where `supports_json_schema`."""
         response = self.generate_text(prompt)
         self.last_response = response
         return parse_json_robust(response.text)
 
 
 class OllamaAdapter(BaseLLMAdapter):
+    supports_json_schema = True
+
     def __init__(self, model_name: str, base_url: str | None = None):
         super().__init__()
         if not model_name:
@@ -45,19 +109,42 @@ class OllamaAdapter(BaseLLMAdapter):
         resolved_base_url = base_url or os.getenv("OLLAMA_BASE_URL")
         if not resolved_base_url:
             raise RuntimeError("OLLAMA_BASE_URL is required. Set it in .env.")
-        self.base_url = resolved_base_url.rstrip("/")
-
-    def generate_text(self, prompt: str) -> ModelResponse:
-        import requests
+        # A comma-separated list spreads concurrent requests over several servers
+        # (CPU-bound inference scales with servers, not client threads). Each thread
+        # sticks to one server so its keep-alive session stays on that host.
+        self.base_urls = [url.strip().rstrip("/") for url in resolved_base_url.split(",") if url.strip()]
+        if not self.base_urls:
+            raise RuntimeError(f"OLLAMA_BASE_URL has no server URL: {resolved_base_url!r}")
+        self.base_url = self.base_urls[0]
+        self._next_server = itertools.count()
+
+        # Mirror the server's OLLAMA_NUM_PARALLEL (see docker-compose.yml) when it is
+        # exported here too; extra client threads would only queue on the server.
+        num_parallel = os.getenv("OLLAMA_NUM_PARALLEL", "").strip()
+        if num_parallel.isdigit() and int(num_parallel) > 0:
+            self.max_concurrency = int(num_parallel)
+
+    def _server(self) -> str:
+        server = getattr(self._local, "server", None)
+        if server is None:
+            server = self._local.server = self.base_urls[next(self._next_server) % len(self.base_urls)]
+        return server
+
+    def _build_payload(self, prompt: str, response_format: str | Dict[str, Any] | None = None) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {
+            "model": self.model_name,
+            "prompt": prompt,
+            "stream": False,
+        }
+        if response_format is not None:
+            payload["format"] = response_format
+        return payload
 
+    def _request(self, payload: Dict[str, Any]) -> ModelResponse:
         start = time.perf_counter()
-        resp = requests.post(
-            f"{self.base_url}/api/generate",
-            json={
-                "model": self.model_name,
-                "prompt": prompt,
-                "stream": False,
-            },
+        resp = self._http().post(
+            f"{self._server()}/api/generate",
+            json=payload,
             timeout=60,
         )
         latency_ms = int((time.perf_counter() - start) * 1000)
@@ -65,7 +152,7 @@ class OllamaAdapter(BaseLLMAdapter):
         if resp.status_code != 200:
             raise RuntimeError(f"Ollama request failed: {resp.status_code} {resp.text[:200]}")
 
-        payload = resp.json()
+        payload = load_json(resp.content)
         text = payload.get("response", "")
         prompt_eval_count = payload.get("prompt_eval_count", 0)
         eval_count = payload.get("eval_count", 0)
@@ -77,6 +164,67 @@ class OllamaAdapter(BaseLLMAdapter):
             estimated_cost_usd=0.0,
         )
 
+    def generate_text(self, prompt: str) -> ModelResponse:
+        return self._request(self._build_payload(prompt))
+
+    def _stream_json_object(self, payload: Dict[str, Any]) -> ModelResponse:
+        """Stream a JSON-mode completion, hanging up only if it runs on past the object.
+
+        Some models keep sampling whitespace after the closing brace in JSON mode until
+        num_predict runs out; dropping the connection stops generation server-side.
+        Token counts arrive only with the final chunk, so they stay 0 when cut short.
+        A normally finished stream is read to its end so the keep-alive connection
+        goes back to the session's pool.
+        """
+        start = time.perf_counter()
+        resp = self._http().post(
+            f"{self._server()}/api/generate",
+            json={**payload, "stream": True},
+            timeout=60,
+            stream=True,
+        )
+        drained = False
+        try:
+            if resp.status_code != 200:
+                raise RuntimeError(f"Ollama request failed: {resp.status_code} {resp.text[:200]}")
+
+            fragments: List[str] = []
+            tracker = _JsonObjectTracker()
+            final: Dict[str, Any] = {}
+            for line in resp.iter_lines():
+                if not line:
+                    continue
+                chunk = load_json(line)
+                if chunk.get("done"):
+                    final = chunk
+                    continue  # keep reading up to the chunked terminator
+                if tracker.closed:
+                    break  # still generating past the object: stop paying for it
+                fragment = chunk.get("response", "")
+                fragments.append(fragment)
+                tracker.feed(fragment)
+            else:
+                drained = True
+        finally:
+            if not drained:
+                resp.close()
+
+        return ModelResponse(
+            text="".join(fragments),
+            latency_ms=int((time.perf_counter() - start) * 1000),
+            prompt_tokens=final.get("prompt_eval_count", 0),
+            completion_tokens=final.get("eval_count", 0),
+            estimated_cost_usd=0.0,
+        )
+
+    def generate_json(self, prompt: str, schema: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        # JSON mode (or structured outputs, given a schema) constrains sampling, so the
+        # model stops at the closing brace instead of spending tokens on markdown fences
+        # or commentary, and cannot drop required keys.
+        response = self._stream_json_object(self._build_payload(prompt, response_format=schema or "json"))
+        self.last_response = response
+        return parse_json_robust(response.text)
+
 
 class OpenAIAdapter(BaseLLMAdapter):
     def __init__(
@@ -143,10 +291,8 @@ class OpenAIAdapter(BaseLLMAdapter):
         raise RuntimeError("OpenAI response did not include any output text.")
 
     def _request(self, payload: Dict[str, Any]) -> ModelResponse:
-        import requests
-
         start = time.perf_counter()
-        resp = requests.post(
+        resp = self._http().post(
             f"{self.base_url}/responses",
             headers=self._headers(),
             json=payload,
@@ -162,7 +308,7 @@ class OpenAIAdapter(BaseLLMAdapter):
             error_message = error_payload.get("error", {}).get("message", resp.text[:500])
             raise RuntimeError(f"OpenAI request failed: {resp.status_code} {error_message}")
 
-        response_payload = resp.json()
+        response_payload = load_json(resp.content)
         usage = response_payload.get("usage", {})
         return ModelResponse(
             text=self._extract_output_text(response_payload),
@@ -170,12 +316,13 @@ class OpenAIAdapter(BaseLLMAdapter):
             prompt_tokens=int(usage.get("input_tokens", 0) or 0),
             completion_tokens=int(usage.get("output_tokens", 0) or 0),
             estimated_cost_usd=0.0,
+            cached_prompt_tokens=int((usage.get("input_tokens_details") or {}).get("cached_tokens", 0) or 0),
         )
 
     def generate_text(self, prompt: str) -> ModelResponse:
         return self._request(self._build_payload(prompt))
 
-    def generate_json(self, prompt: str) -> Dict[str, Any]:
+    def generate_json(self, prompt: str, schema: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         response = self._request(self._build_payload(prompt, text_format={"type": "json_object"}))
         self.last_response = response
         return parse_json_robust(response.text)
@@ -3,13 +3,29 @@ from __future__ import annotations
 import ast
 import json
 import re
-from typing import Any, Dict
+from typing import Any, Dict, Iterator
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
 
 
 class LLMParseError(ValueError):
     pass
 
 
+def load_json(data: str | bytes) -> Any:
+    """json.loads through orjson when installed; input orjson rejects (NaN, lone
+    surrogates) is retried with the stdlib so accepted documents do not change."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
 def _extract_braced_block(text: str) -> str:
     start = text.find("{")
     if start == -1:
@@ -27,20 +43,25 @@ def _extract_braced_block(text: str) -> str:
     return text[start:]
 
 
+_FENCED_JSON = re.compile(r"```(?:json)?\s*(\{[\s\S]*?\})\s*```")
+
+
+def _candidates(stripped: str) -> Iterator[str]:
+    # Lazy: JSON-mode output parses on the first candidate, so the fence search and the
+    # per-character brace scan only run for sloppy output.
+    yield stripped
+    yield from _FENCED_JSON.findall(stripped)
+    yield _extract_braced_block(stripped)
+
+
 def parse_json_robust(raw_text: str) -> Dict[str, Any]:
-    candidates = []
     stripped = raw_text.strip()
-    candidates.append(stripped)
-
-    fenced = re.findall(r"```(?:json)?\s*(\{[\s\S]*?\})\s*```", stripped)
-    candidates.extend(fenced)
-    candidates.append(_extract_braced_block(stripped))
 
-    for candidate in candidates:
+    for candidate in _candidates(stripped):
         if not candidate:
             continue
         try:
-            parsed = json.loads(candidate)
+            parsed = load_json(candidate)
             if isinstance(parsed, dict):
                 return parsed
         except json.JSONDecodeError:
@@ -58,7 +79,7 @@ def parse_json_robust(raw_text: str) -> Dict[str, Any]:
         normalized = re.sub(r"'([^']*)'", r'"\1"', candidate)
         normalized = re.sub(r",\s*([}\]])", r"\1", normalized)
         try:
-            parsed = json.loads(normalized)
+            parsed = load_json(normalized)
             if isinstance(parsed, dict):
                 return parsed
         except json.JSONDecodeError:
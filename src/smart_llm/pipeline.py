@@ -1,18 +1,129 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Dict, List
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
 
 from smart_llm.config import RuntimeConfig, default_robots, default_skills
 from smart_llm.environment import AI2ThorAdapter
 from smart_llm.llm import build_adapter
+from smart_llm.llm.adapters import ModelResponse
+from smart_llm.llm.parser import load_json
 from smart_llm.metrics import Evaluator
 from smart_llm.models import Stage1Output
-from smart_llm.schemas import SchemaValidator
+from smart_llm.schemas import SchemaValidator, stage1_from_dict, stage1_to_dict
 from smart_llm.stages import CoalitionFormer, Stage1Decomposer, Stage4Executor, TaskAllocator
+from smart_llm.stages.stage1_decomposition import PROMPT_OBJECT_LIMIT, normalize_command, prompt_fingerprint
+
+
+PROMPT_VERSION = "stage1_v4_yaml"
+# Stage-1 requests in flight at once when several commands are planned together.
+LLM_CONCURRENCY = 4
+
+# A stage-1 decomposition and the LLM response it came from.
+Plan = Tuple[Stage1Output, Optional[ModelResponse]]
+
+
+def _split_response(response: Optional[ModelResponse], count: int) -> Optional[ModelResponse]:
+    # A batched request is billed once; attribute an even share of its tokens and cost to
+    # each plan so per-run reports still add up. Every plan waited the full latency.
+    if response is None or count <= 1:
+        return response
+    return replace(
+        response,
+        prompt_tokens=response.prompt_tokens // count,
+        cached_prompt_tokens=response.cached_prompt_tokens // count,
+        completion_tokens=response.completion_tokens // count,
+        estimated_cost_usd=response.estimated_cost_usd / count,
+    )
+
+
+def _dump_json(value: Any) -> bytes:
+    # Compact UTF-8; orjson serializes in C when installed.
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class RequestPacer:
+    """Space request starts at least 60/qpm seconds apart across threads (0 disables)."""
+
+    def __init__(self, qpm: float = 0.0):
+        self.interval = 60.0 / qpm if qpm > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class PlanCache:
+    """Exact-match stage-1 plan cache persisted as JSON.
+
+    Keys hash the provider, model, prompt version and fingerprint, normalized command and
+    the scene objects shown to the planner, so a changed scene or prompt never reuses a plan.
+    `put` only updates memory; `flush` rewrites the file once per batch of new plans.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._tmp_path = self.path.with_name(self.path.name + ".tmp")
+        self._lock = threading.Lock()
+        self._dirty = False
+        try:
+            plans = load_json(self.path.read_bytes())
+        except (OSError, ValueError):
+            plans = None
+        # A file holding anything but an object (e.g. `[]`) is treated like a corrupt one.
+        self._plans: Dict[str, Dict[str, Any]] = plans if isinstance(plans, dict) else {}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(provider: str, model: str, user_command: str, objects: List[Any]) -> str:
+        scene = [getattr(obj, "__dict__", obj) for obj in objects]
+        raw = json.dumps(
+            [provider, model, PROMPT_VERSION, prompt_fingerprint(), normalize_command(user_command), scene],
+            ensure_ascii=False,
+            sort_keys=True,
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Stage1Output]:
+        with self._lock:
+            payload = self._plans.get(key)
+        return stage1_from_dict(payload) if payload is not None else None
 
+    def put(self, key: str, stage1: Stage1Output) -> None:
+        with self._lock:
+            self._plans[key] = stage1_to_dict(stage1)
+            self._dirty = True
 
-PROMPT_VERSION = "stage1_v3_yaml"
+    def flush(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            self._tmp_path.write_bytes(_dump_json(self._plans))
+            os.replace(self._tmp_path, self.path)
+            self._dirty = False
 
 
 @dataclass
@@ -26,23 +137,53 @@ class PipelineResult:
 
 
 class SMARTPipeline:
+    """Stage 1-4 pipeline over one AI2-THOR simulator kept alive between runs.
+
+    The simulator (a Unity process) is only shut down by `close()`, so always call it,
+    or use the pipeline as a context manager: `with SMARTPipeline(config) as pipeline:`.
+    """
+
     def __init__(self, config: RuntimeConfig):
         self.config = config
         self.validator = SchemaValidator()
         self.skills = default_skills()
         self.adapter = build_adapter(provider=config.provider, model=config.model)
+        self._env: AI2ThorAdapter | None = None
+        self.plan_cache = PlanCache(config.plan_cache_path) if config.plan_cache_path else None
+        self.pacer = RequestPacer(config.llm_qpm)
 
-    def _build_env(self, *, enable_recording: bool) -> AI2ThorAdapter:
+    def _build_env(self) -> AI2ThorAdapter:
         return AI2ThorAdapter(
             profile=self.config.profile,
             dry_run=self.config.dry_run,
-            record_overhead_video=self.config.record_overhead_video if enable_recording else False,
-            record_agent_video=self.config.record_agent_video if enable_recording else False,
+            record_overhead_video=self.config.record_overhead_video,
+            record_agent_video=self.config.record_agent_video,
             output_dir=self.config.record_dir,
             observer_fov=self.config.observer_fov,
             observer_height_padding=self.config.observer_height_padding,
+            video_codec=self.config.video_codec,
         )
 
+    def _session_env(self) -> AI2ThorAdapter:
+        # One simulator serves every run of this pipeline; `start` resets the scene in
+        # place, which is far cheaper than launching Unity again per command.
+        if self._env is None:
+            self._env = self._build_env()
+        return self._env
+
+    def close(self) -> None:
+        """Shut down the simulator kept alive between runs."""
+        self._flush_plans()
+        env, self._env = self._env, None
+        if env is not None:
+            env.stop()
+
+    def __enter__(self) -> "SMARTPipeline":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
     def _recommended_agent_count(self, stage1: Stage1Output) -> int:
         levels: Dict[str, int] = {}
         pending = {sub.subtask_id: sub for sub in stage1.subtasks}
@@ -71,32 +212,122 @@ class SMARTPipeline:
         suggested = max(concurrent.values(), default=1)
         return max(1, min(self.config.max_agents, suggested))
 
-    def run_once(self, user_command: str, goal_states: List[Dict[str, Any]] | None = None) -> PipelineResult:
-        bootstrap_env = self._build_env(enable_recording=False)
-        bootstrap_env.start(agent_count=1)
+    def _prepare_execution_env(self, env: AI2ThorAdapter, agent_count: int) -> None:
+        env.start(agent_count=agent_count)
+        env.prefetch_reachable_positions()
 
+    def _probe_objects(self) -> List[Any]:
+        env = self._session_env()
         try:
-            objects = bootstrap_env.list_environment_objects(agent_id=0)
-        finally:
-            bootstrap_env.stop()
+            env.start(agent_count=1, record=False)
+            return env.list_environment_objects(agent_id=0, limit=PROMPT_OBJECT_LIMIT)
+        except BaseException:
+            self.close()
+            raise
+
+    def _cache_key(self, user_command: str, objects: List[Any]) -> str:
+        model = getattr(self.adapter, "model_name", self.config.model)
+        return PlanCache.key(self.config.provider, model, user_command, objects)
+
+    def _cached_plan(self, user_command: str, objects: List[Any]) -> Plan | None:
+        if self.plan_cache is None:
+            return None
+        stage1 = self.plan_cache.get(self._cache_key(user_command, objects))
+        # A cache hit made no LLM call, so there is no response to report.
+        return (stage1, None) if stage1 is not None else None
 
+    def _store_plan(self, user_command: str, objects: List[Any], stage1: Stage1Output) -> None:
+        if self.plan_cache is not None:
+            self.plan_cache.put(self._cache_key(user_command, objects), stage1)
+
+    def _flush_plans(self) -> None:
+        if self.plan_cache is not None:
+            self.plan_cache.flush()
+
+    def _plan(self, user_command: str, objects: List[Any]) -> Plan:
+        cached = self._cached_plan(user_command, objects)
+        if cached is not None:
+            return cached
+        self.pacer.wait()
         stage1 = Stage1Decomposer(adapter=self.adapter, validator=self.validator).run(
             user_command=user_command,
             skills=self.skills,
             objects=objects,
         )
-        robots = default_robots(self._recommended_agent_count(stage1))
+        self._store_plan(user_command, objects, stage1)
+        return stage1, getattr(self.adapter, "last_response", None)
 
-        env = self._build_env(enable_recording=True)
-        env.start(agent_count=len(robots))
+    def _plan_batch(self, user_commands: Sequence[str], objects: List[Any]) -> List[Plan]:
+        plans: List[Plan | None] = [self._cached_plan(cmd, objects) for cmd in user_commands]
+        misses = [idx for idx, plan in enumerate(plans) if plan is None]
+        if len(misses) == 1:
+            plans[misses[0]] = self._plan(user_commands[misses[0]], objects)
+        elif misses:
+            self.pacer.wait()
+            stage1s = Stage1Decomposer(adapter=self.adapter, validator=self.validator).run_batch(
+                user_commands=[user_commands[idx] for idx in misses],
+                skills=self.skills,
+                objects=objects,
+            )
+            shared = _split_response(getattr(self.adapter, "last_response", None), len(misses))
+            for idx, stage1 in zip(misses, stage1s):
+                if stage1 is None:
+                    plans[idx] = self._plan(user_commands[idx], objects)
+                else:
+                    self._store_plan(user_commands[idx], objects, stage1)
+                    plans[idx] = (stage1, shared)
+        return plans  # type: ignore[return-value]
 
+    def plan_many(self, user_commands: Sequence[str]) -> List[Plan]:
+        """Run stage 1 for several commands, overlapping their LLM round-trips.
+
+        Every run starts from the same freshly reset scene, so one object probe serves
+        all commands. With `config.plan_batch_size` > 1, up to that many commands share
+        one LLM request; commands the batched answer misses are planned on their own.
+        Pass each plan to `run_once` in order.
+        """
+        if not user_commands:
+            return []
+        objects = self._probe_objects()
+        size = max(1, self.config.plan_batch_size)
+        batches = [user_commands[idx : idx + size] for idx in range(0, len(user_commands), size)]
+        concurrency = min(LLM_CONCURRENCY, getattr(self.adapter, "max_concurrency", None) or LLM_CONCURRENCY)
         try:
-            stage2 = CoalitionFormer(validator=self.validator).run(stage1_output=stage1, robots=robots)
-            stage3 = TaskAllocator(validator=self.validator).run(
-                stage1_output=stage1,
-                stage2_output=stage2,
-                robots=robots,
-            )
+            with ThreadPoolExecutor(max_workers=min(concurrency, len(batches))) as pool:
+                return [plan for plans in pool.map(partial(self._plan_batch, objects=objects), batches) for plan in plans]
+        finally:
+            # Persist this batch's new plans in one write, even if a later command failed.
+            self._flush_plans()
+
+    def run_once(
+        self,
+        user_command: str,
+        goal_states: List[Dict[str, Any]] | None = None,
+        plan: Plan | None = None,
+    ) -> PipelineResult:
+        # One controller serves both the object probe and execution; it is re-initialized
+        # with the final agent count instead of launching a second Unity process.
+        if plan is None:
+            plan = self._plan(user_command, self._probe_objects())
+            self._flush_plans()
+        stage1, llm_response = plan
+        env = self._session_env()
+        completed = False
+        try:
+            robots = default_robots(self._recommended_agent_count(stage1))
+
+            # Re-initializing the simulator for the final agent count waits on Unity, while
+            # stages 2-3 only need stage 1 and the robots; overlap the two. The controller
+            # is touched by the worker thread alone until it is joined.
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                env_ready = pool.submit(self._prepare_execution_env, env, len(robots))
+                stage2 = CoalitionFormer(validator=self.validator).run(stage1_output=stage1, robots=robots)
+                stage3 = TaskAllocator(validator=self.validator).run(
+                    stage1_output=stage1,
+                    stage2_output=stage2,
+                    robots=robots,
+                )
+                env_ready.result()
             stage4 = Stage4Executor(env_adapter=env, robots=robots).run(stage3_output=stage3)
 
             evaluator = Evaluator()
@@ -116,13 +347,13 @@ class SMARTPipeline:
                 "subtasks": [s.__dict__ for s in stage1.subtasks],
                 "prompt_version": PROMPT_VERSION,
             }
-            llm_response = getattr(self.adapter, "last_response", None)
             if llm_response is not None:
                 stage1_payload["llm"] = {
                     "provider": self.config.provider,
                     "model": getattr(self.adapter, "model_name", self.config.model),
                     "latency_ms": llm_response.latency_ms,
                     "prompt_tokens": llm_response.prompt_tokens,
+                    "cached_prompt_tokens": llm_response.cached_prompt_tokens,
                     "completion_tokens": llm_response.completion_tokens,
                     "estimated_cost_usd": llm_response.estimated_cost_usd,
                 }
@@ -130,7 +361,7 @@ class SMARTPipeline:
             artifacts = env.artifacts()
             artifacts["agent_count"] = len(robots)
 
-            return PipelineResult(
+            result = PipelineResult(
                 stage1=stage1_payload,
                 stage2={
                     "coalitions": [c.__dict__ for c in stage2.coalitions],
@@ -150,5 +381,11 @@ class SMARTPipeline:
                 metrics=metrics.__dict__,
                 artifacts=artifacts,
             )
+            completed = True
+            return result
         finally:
-            env.stop()
+            # A failed run may leave the simulator in an unknown state; relaunch next time.
+            if completed:
+                env.finish_session()
+            else:
+                self.close()
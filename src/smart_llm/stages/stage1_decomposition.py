@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import unicodedata
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
 from smart_llm.knowledge import (
     format_interaction_catalog,
@@ -16,6 +19,7 @@ from smart_llm.llm import BaseLLMAdapter
 from smart_llm.llm.prompt_yaml import parse_simple_yaml
 from smart_llm.models import EnvironmentObject, SkillSpec, Stage1Output, Subtask
 from smart_llm.schemas import SchemaValidator, stage1_to_dict
+from smart_llm.schemas.json_schemas import STAGE1_SCHEMA
 
 
 FALLBACK_TASK_SKILL_MAP = {
@@ -38,21 +42,89 @@ REQUIRED_PARAMETERS = {
     "clean_object": ("object",),
 }
 SUPPORTED_TASK_TYPES = set(FALLBACK_TASK_SKILL_MAP)
+# Scene objects serialized into the prompt; callers may list only this many.
+PROMPT_OBJECT_LIMIT = 80
+
+
+def normalize_command(user_command: str) -> str:
+    """NFC-compose and whitespace-collapse a command before it is planned.
+
+    Commands typed or pasted on macOS often arrive as decomposed jamo (NFD), which
+    costs several times the tokens of composed Hangul and defeats the syllable-based
+    keyword checks below (e.g. "썰" in the command).
+    """
+    return " ".join(unicodedata.normalize("NFC", user_command).split())
+
+
+def _compact_json(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _prompt_object(obj: EnvironmentObject) -> Dict[str, Any]:
+    # Centimetre precision is plenty for the planner; raw THOR floats carry ~16 digits each.
+    row = dict(obj.__dict__)
+    row["position"] = {axis: round(value, 2) if isinstance(value, float) else value for axis, value in obj.position.items()}
+    return row
+
+
+@lru_cache(maxsize=1)
+def _load_resources() -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]], Dict[str, List[str]]]:
+    """Prompt spec and catalog tables, parsed once and shared (read-only) by every decomposer."""
+    prompt_path = Path(__file__).resolve().parent.parent / "llm" / "prompts" / "stage1_task_decomposition.yaml"
+    prompt_spec = parse_simple_yaml(prompt_path.read_text(encoding="utf-8"))
+
+    catalog = load_world_knowledge()
+    objects_by_type = {
+        row.get("objectType", ""): row for row in catalog.get("objects", []) if row.get("objectType")
+    }
+    task_skill_map = {**FALLBACK_TASK_SKILL_MAP, **task_type_to_skills_map()}
+    return prompt_spec, objects_by_type, task_skill_map
+
+
+@lru_cache(maxsize=1)
+def _static_prompt_parts() -> Tuple[str, str]:
+    """Rendered prompt header and the template with its catalogs filled in.
+
+    Only skills, scene objects and the command vary between requests.
+    """
+    prompt_spec = _load_resources()[0]
+    system = prompt_spec.get("system", "")
+    rules = prompt_spec.get("rules", [])
+    task_types = prompt_spec.get("task_types", [])
+    output_schema_raw = prompt_spec.get("output_schema_json", "{}")
+    output_schema = json.loads(output_schema_raw) if isinstance(output_schema_raw, str) else {}
+
+    template = prompt_spec.get("prompt_template", "")
+    template = template.replace("{scene_catalog}", format_scene_catalog())
+    template = template.replace("{object_catalog}", format_object_catalog(max_count=600))
+    template = template.replace("{interaction_catalog}", format_interaction_catalog())
+
+    lines: List[str] = [system]
+    if task_types:
+        lines.append("Known task types:\n- " + "\n- ".join(task_types))
+    if rules:
+        lines.append("Rules:\n" + "\n".join(f"{idx + 1}. {rule}" for idx, rule in enumerate(rules)))
+    lines.append("Output schema:\n" + json.dumps(output_schema, ensure_ascii=False, indent=2))
+    return "\n\n".join(lines), template
+
+
+@lru_cache(maxsize=1)
+def prompt_fingerprint() -> str:
+    """Short hash of everything static in the stage-1 prompts (header, template, output
+    and batch instructions), so plan caches follow prompt edits without a manual version bump."""
+    header, template = _static_prompt_parts()
+    prompt_spec = _load_resources()[0]
+    raw = "\0".join(
+        (header, template, prompt_spec.get("output_instruction", ""), prompt_spec.get("batch_instruction", ""))
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
 
 
 class Stage1Decomposer:
     def __init__(self, adapter: BaseLLMAdapter, validator: SchemaValidator):
         self.adapter = adapter
         self.validator = validator
-
-        prompt_path = Path(__file__).resolve().parent.parent / "llm" / "prompts" / "stage1_task_decomposition.yaml"
-        self.prompt_spec = parse_simple_yaml(prompt_path.read_text(encoding="utf-8"))
-
-        catalog = load_world_knowledge()
-        self.objects_by_type: Dict[str, Dict[str, Any]] = {
-            row.get("objectType", ""): row for row in catalog.get("objects", []) if row.get("objectType")
-        }
-        self.task_skill_map = {**FALLBACK_TASK_SKILL_MAP, **task_type_to_skills_map()}
+        self.prompt_spec, self.objects_by_type, self.task_skill_map = _load_resources()
 
     def run(
         self,
@@ -60,46 +132,86 @@ class Stage1Decomposer:
         skills: List[SkillSpec],
         objects: List[EnvironmentObject],
     ) -> Stage1Output:
+        user_command = normalize_command(user_command)
         prompt = self._build_prompt(user_command=user_command, skills=skills, objects=objects)
 
         try:
-            payload = self.adapter.generate_json(prompt)
+            payload = self._generate_json(prompt, STAGE1_SCHEMA)
         except Exception as exc:
             if not getattr(self.adapter, "allow_heuristic_fallback", False):
                 raise RuntimeError(f"Stage 1 decomposition failed: {exc}") from exc
             payload = self._heuristic_decompose(user_command)
 
+        return self._finish(payload, user_command)
+
+    def run_batch(
+        self,
+        user_commands: List[str],
+        skills: List[SkillSpec],
+        objects: List[EnvironmentObject],
+    ) -> List[Optional[Stage1Output]]:
+        """Decompose several commands with a single LLM request.
+
+        The catalogs, skills and scene objects are sent once for the whole batch. An
+        entry is None when the batched answer does not yield a valid plan for that
+        command (or the request failed); callers should `run` those individually.
+        """
+        user_commands = [normalize_command(command) for command in user_commands]
+        numbered = "\n".join(f"{idx + 1}. {command}" for idx, command in enumerate(user_commands))
+        instruction = self.prompt_spec.get("batch_instruction", "").replace("{count}", str(len(user_commands)))
+        prompt = self._build_prompt(user_command=numbered, skills=skills, objects=objects, output_instruction=instruction)
+
+        count = len(user_commands)
+        batch_schema = {
+            "type": "object",
+            "required": ["plans"],
+            "properties": {"plans": {"type": "array", "minItems": count, "maxItems": count, "items": STAGE1_SCHEMA}},
+        }
+        try:
+            payload = self._generate_json(prompt, batch_schema)
+        except Exception:
+            return [None] * count
+
+        plans = payload.get("plans") if isinstance(payload, dict) else None
+        if not isinstance(plans, list) or len(plans) != len(user_commands):
+            return [None] * len(user_commands)
+
+        outputs: List[Optional[Stage1Output]] = []
+        for user_command, plan in zip(user_commands, plans):
+            try:
+                outputs.append(self._finish(plan, user_command))
+            except Exception:
+                outputs.append(None)
+        return outputs
+
+    def _generate_json(self, prompt: str, schema: Dict[str, Any]) -> Dict[str, Any]:
+        if getattr(self.adapter, "supports_json_schema", False):
+            return self.adapter.generate_json(prompt, schema=schema)
+        return self.adapter.generate_json(prompt)
+
+    def _finish(self, payload: Dict[str, Any], user_command: str) -> Stage1Output:
         self.validator.validate_stage1(payload)
         payload = self._normalize_payload(payload, user_command)
         self.validator.validate_stage1(payload)
         subtasks = [Subtask(**item) for item in payload["subtasks"]]
         return Stage1Output(subtasks=subtasks)
 
-    def _build_prompt(self, user_command: str, skills: List[SkillSpec], objects: List[EnvironmentObject]) -> str:
-        system = self.prompt_spec.get("system", "")
-        rules = self.prompt_spec.get("rules", [])
-        task_types = self.prompt_spec.get("task_types", [])
-        output_schema_raw = self.prompt_spec.get("output_schema_json", "{}")
-        output_schema = json.loads(output_schema_raw) if isinstance(output_schema_raw, str) else {}
-        prompt_template = self.prompt_spec.get("prompt_template", "")
-
-        rendered_template = prompt_template
+    def _build_prompt(
+        self,
+        user_command: str,
+        skills: List[SkillSpec],
+        objects: List[EnvironmentObject],
+        output_instruction: Optional[str] = None,
+    ) -> str:
+        header, template = _static_prompt_parts()
+        if output_instruction is None:
+            output_instruction = self.prompt_spec.get("output_instruction", "")
+        rendered_template = template
+        rendered_template = rendered_template.replace("{skills_json}", _compact_json([s.__dict__ for s in skills]))
+        rendered_template = rendered_template.replace("{objects_json}", _compact_json([_prompt_object(o) for o in objects[:PROMPT_OBJECT_LIMIT]]))
         rendered_template = rendered_template.replace("{user_command}", user_command)
-        rendered_template = rendered_template.replace("{scene_catalog}", format_scene_catalog())
-        rendered_template = rendered_template.replace("{object_catalog}", format_object_catalog(max_count=600))
-        rendered_template = rendered_template.replace("{interaction_catalog}", format_interaction_catalog())
-        rendered_template = rendered_template.replace("{skills_json}", json.dumps([s.__dict__ for s in skills], ensure_ascii=False))
-        rendered_template = rendered_template.replace("{objects_json}", json.dumps([o.__dict__ for o in objects[:80]], ensure_ascii=False))
-
-        lines: List[str] = [system]
-        if task_types:
-            lines.append("Known task types:\n- " + "\n- ".join(task_types))
-        if rules:
-            lines.append("Rules:\n" + "\n".join(f"{idx + 1}. {rule}" for idx, rule in enumerate(rules)))
-
-        lines.append("Output schema:\n" + json.dumps(output_schema, ensure_ascii=False, indent=2))
-        lines.append(rendered_template)
-        return "\n\n".join(lines).strip()
+        rendered_template = rendered_template.replace("{output_instruction}", output_instruction.strip())
+        return f"{header}\n\n{rendered_template}".strip()
 
     def _heuristic_decompose(self, user_command: str) -> Dict[str, Any]:
         command = user_command.lower()
@@ -12,6 +12,8 @@ if str(SRC) not in sys.path:
     sys.path.insert(0, str(SRC))
 
 from smart_llm.environment import AI2ThorAdapter
+from smart_llm.environment import video
+from smart_llm.environment.video import FFmpegPipeWriter, OpenCVVideoWriter, ThreadedVideoWriter, open_video_writer
 
 
 class TestEnvironmentAdapter(unittest.TestCase):
@@ -42,6 +44,30 @@ class TestEnvironmentAdapter(unittest.TestCase):
         self.assertFalse(env.check_precondition("navigate", {}, agent_id=0))
         self.assertFalse(env.execute_step("navigate", "navigate", {}, agent_id=0))
 
+    def test_object_index_rebuilds_only_when_metadata_changes(self):
+        env = AI2ThorAdapter(profile="dev", dry_run=False)
+        env.context.agent_count = 1
+        first = {"objects": [{"objectId": "Tomato|1", "objectType": "Tomato", "visible": True}]}
+        env.context.controller = SimpleNamespace(last_event=SimpleNamespace(metadata=first))
+
+        index = env._objects_by_type()
+        self.assertIs(env._objects_by_type(), index)
+        self.assertEqual(env._find_any("Tomato")["objectId"], "Tomato|1")
+
+        second = {"objects": [{"objectId": "Tomato|2", "objectType": "Tomato", "visible": False}]}
+        env.context.controller.last_event = SimpleNamespace(metadata=second)
+        self.assertEqual(env._find_any("Tomato")["objectId"], "Tomato|2")
+        self.assertIsNone(env._find_visible("Tomato"))
+
+    def test_list_environment_objects_honours_limit(self):
+        env = AI2ThorAdapter(profile="dev", dry_run=True)
+        env.start(agent_count=1)
+
+        all_objects = env.list_environment_objects()
+        limited = env.list_environment_objects(limit=2)
+        self.assertEqual(len(limited), 2)
+        self.assertEqual([o.objectType for o in limited], [o.objectType for o in all_objects[:2]])
+
     def test_object_specific_interaction_distances(self):
         env = AI2ThorAdapter(profile="dev", dry_run=True)
 
@@ -82,6 +108,413 @@ class TestEnvironmentAdapter(unittest.TestCase):
 
         self.assertEqual(env._agent_writers[0].frames, 1)
 
+    def test_capture_agent_frames_writes_changed_views_and_reuses_identical_ones(self):
+        import numpy as np
+
+        class DummyWriter:
+            def __init__(self):
+                self.frames = []
+
+            def write(self, frame):
+                self.frames.append(frame)
+
+        def frame(value):
+            return np.full((4, 4, 3), value, dtype=np.uint8)
+
+        env = AI2ThorAdapter(profile="dev", dry_run=False, record_agent_video=True)
+        env.context.controller = SimpleNamespace(last_event=None)
+        env.context.agent_count = 2
+        env._agent_writers = {0: DummyWriter(), 1: DummyWriter()}
+
+        a0, b0 = frame(0), frame(10)
+        env.capture_agent_frames(SimpleNamespace(events=[SimpleNamespace(frame=a0), SimpleNamespace(frame=b0)]))
+        # Agent 0 acts; agent 1's view changes too (shared scene), so it is not frozen.
+        a1, b1 = frame(1), frame(11)
+        env.capture_agent_frames(SimpleNamespace(events=[SimpleNamespace(frame=a1), SimpleNamespace(frame=b1)]), acting_agent_id=0)
+        self.assertIs(env._agent_writers[1].frames[-1], b1)
+        # A pixel-identical re-render re-writes the previous frame object.
+        env.capture_agent_frames(SimpleNamespace(events=[SimpleNamespace(frame=frame(2)), SimpleNamespace(frame=frame(11))]), acting_agent_id=0)
+        self.assertIs(env._agent_writers[1].frames[-1], b1)
+
+        # A failed action does not freeze the view: the scene may still have changed.
+        a3 = frame(3)
+        failed = SimpleNamespace(
+            events=[SimpleNamespace(frame=a3, metadata={"lastActionSuccess": False}), SimpleNamespace(frame=frame(12))]
+        )
+        env.capture_agent_frames(failed, acting_agent_id=0)
+        self.assertIs(env._agent_writers[0].frames[-1], a3)
+        self.assertEqual(int(env._agent_writers[1].frames[-1][0, 0, 0]), 12)
+        self.assertEqual([len(writer.frames) for writer in env._agent_writers.values()], [4, 4])
+
+    def test_shared_reachable_grid_includes_every_agent_cell(self):
+        def agent_meta(x, z, **extra):
+            return SimpleNamespace(metadata={"agent": {"position": {"x": x, "y": 0.9, "z": z}}, **extra})
+
+        grid_cells = [{"x": 0.0, "y": 0.9, "z": 0.0}, {"x": 0.25, "y": 0.9, "z": 0.0}]
+        event = SimpleNamespace(
+            events=[
+                agent_meta(0.0, 0.0, lastActionSuccess=True, actionReturn=grid_cells),
+                agent_meta(0.5, 0.0),
+            ]
+        )
+        env = AI2ThorAdapter(profile="dev", dry_run=False)
+        env.context.controller = SimpleNamespace(step=lambda **kwargs: event)
+        env.context.agent_count = 2
+
+        grid = env._reachable_positions_for(0)
+        self.assertEqual(len(grid.positions), 3)
+        self.assertIsNotNone(grid.index_of({"x": 0.5, "z": 0.0}))
+        self.assertIs(env._reachable_positions_for(1), grid)
+
+    def test_capture_overhead_frame_reuses_unchanged_frame(self):
+        import numpy as np
+
+        class DummyWriter:
+            def __init__(self):
+                self.frames = []
+
+            def write(self, frame):
+                self.frames.append(frame)
+
+        env = AI2ThorAdapter(profile="dev", dry_run=False, record_overhead_video=True)
+        env.observer_camera_id = 0
+        env._observer_writer = DummyWriter()
+        first = np.zeros((16, 16, 3), dtype=np.uint8)
+        same = first.copy()
+        changed = first.copy()
+        changed[8, 8] = 255
+        # A change between any sparse sample grid's pixels must still be recorded.
+        subtle = changed.copy()
+        subtle[3, 5] = 1
+        env.context.controller = SimpleNamespace(last_event=None)
+
+        for frame in (first, same, changed, subtle):
+            env.capture_overhead_frame(SimpleNamespace(third_party_camera_frames=[frame]))
+
+        written = env._observer_writer.frames
+        self.assertIs(written[0], first)
+        self.assertIs(written[1], first)
+        self.assertIs(written[2], changed)
+        self.assertIs(written[3], subtle)
+
+    def test_opencv_writer_skips_conversion_for_repeated_frame(self):
+        conversions = []
+
+        class DummyWriter:
+            def __init__(self):
+                self.frames = []
+
+            def write(self, frame):
+                self.frames.append(frame)
+
+        def fake_cvt(value, _code, dst=None):
+            _ = dst
+            conversions.append(value)
+            return ("bgr", value)
+
+        fake_cv2 = SimpleNamespace(cvtColor=fake_cvt, COLOR_RGB2BGR=0)
+        inner = DummyWriter()
+        writer = OpenCVVideoWriter(inner)
+        frame = object()
+        with patch.dict(sys.modules, {"cv2": fake_cv2}):
+            writer.write(frame)
+            writer.write(frame)
+
+        self.assertEqual(conversions, [frame])
+        self.assertEqual(inner.frames, [("bgr", frame), ("bgr", frame)])
+
+    def test_threaded_writer_flushes_copies_in_order_on_release(self):
+        class DummyWriter:
+            def __init__(self):
+                self.frames = []
+                self.released = False
+
+            def write(self, frame):
+                self.frames.append(frame)
+
+            def release(self):
+                self.released = True
+
+        class Frame:
+            def __init__(self, value):
+                self.value = value
+
+            def copy(self):
+                return Frame(self.value)
+
+        inner = DummyWriter()
+        writer = ThreadedVideoWriter(inner, maxsize=2)
+        first, second = Frame(1), Frame(2)
+        for frame in (first, first, second):
+            writer.write(frame)
+        writer.release()
+
+        self.assertTrue(inner.released)
+        self.assertEqual([frame.value for frame in inner.frames], [1, 1, 2])
+        self.assertIsNot(inner.frames[0], first)
+        self.assertIs(inner.frames[0], inner.frames[1])
+
+    def test_threaded_writer_reuses_preallocated_ring_buffers(self):
+        import numpy as np
+
+        class DummyWriter:
+            def __init__(self):
+                self.values = []
+                self.buffers = set()
+
+            def write(self, frame):
+                self.values.append(int(frame[0, 0, 0]))
+                self.buffers.add(id(frame))
+
+            def release(self):
+                pass
+
+        inner = DummyWriter()
+        writer = ThreadedVideoWriter(inner, maxsize=2)
+        for value in range(10):
+            writer.write(np.full((2, 2, 3), value, dtype=np.uint8))
+        writer.release()
+
+        self.assertEqual(inner.values, list(range(10)))
+        self.assertLessEqual(len(inner.buffers), 4)
+
+    def test_threaded_writer_converts_frames_on_worker_thread(self):
+        import threading
+
+        import numpy as np
+
+        class ConvertingWriter(OpenCVVideoWriter):
+            def __init__(self):
+                super().__init__(SimpleNamespace(write=lambda _frame: None, release=lambda: None))
+                self.values = []
+                self.threads = set()
+
+            def prepare(self, frame, out=None):
+                self.threads.add(threading.current_thread())
+                self.values.append(int(frame[0, 0, 0]))
+                return frame[..., ::-1]
+
+        inner = ConvertingWriter()
+        writer = ThreadedVideoWriter(inner, maxsize=2)
+        frames = [np.full((2, 2, 3), value, dtype=np.uint8) for value in range(6)]
+        for frame in frames:
+            writer.write(frame)
+        writer.write(frames[-1])
+        writer.release()
+
+        self.assertEqual(inner.values, [0, 1, 2, 3, 4, 5])
+        self.assertNotIn(threading.current_thread(), inner.threads)
+
+    def test_ffmpeg_pipe_writer_sends_i420_for_even_sizes(self):
+        import numpy as np
+
+        opened = []
+        sent = []
+
+        def fake_write_frames(path, size, **kwargs):
+            opened.append(kwargs["pix_fmt_in"])
+            while True:
+                frame = yield
+                sent.append(frame)
+
+        fake_imageio_ffmpeg = SimpleNamespace(write_frames=fake_write_frames)
+        frame = np.zeros((4, 6, 3), dtype=np.uint8)
+        with patch.dict(sys.modules, {"imageio_ffmpeg": fake_imageio_ffmpeg}):
+            writer = FFmpegPipeWriter("out.mp4", 6, 4, 10)
+            writer.write(frame)
+            writer.write(frame)
+            writer.release()
+            odd = FFmpegPipeWriter("odd.mp4", 5, 3, 10)
+            odd.write(np.zeros((3, 5, 3), dtype=np.uint8))
+
+        self.assertEqual(opened, ["yuv420p", "rgb24"])
+        self.assertEqual(sent[0].shape, (6, 6))
+        self.assertIs(sent[0], sent[1])
+        self.assertEqual(sent[2].shape, (3, 5, 3))
+
+    def test_open_video_writer_falls_back_to_opencv_codecs(self):
+        class DummyWriter:
+            def __init__(self, opened):
+                self.opened = opened
+
+            def isOpened(self):
+                return self.opened
+
+            def release(self):
+                pass
+
+        attempts = []
+
+        def fake_writer(path, backend, fourcc, fps, size):
+            _ = (path, backend, fps, size)
+            attempts.append(fourcc)
+            return DummyWriter(opened=fourcc == "mp4v")
+
+        def broken_pipe(*_args, **_kwargs):
+            raise RuntimeError("ffmpeg unavailable")
+
+        fake_cv2 = SimpleNamespace(
+            CAP_FFMPEG=1900,
+            VideoWriter=fake_writer,
+            VideoWriter_fourcc=lambda *chars: "".join(chars),
+        )
+        fake_imageio_ffmpeg = SimpleNamespace(write_frames=broken_pipe)
+        with patch.dict(sys.modules, {"cv2": fake_cv2, "imageio_ffmpeg": fake_imageio_ffmpeg}):
+            writer = open_video_writer("out.mp4", 4, 4, 10)
+
+        self.assertIsInstance(writer, OpenCVVideoWriter)
+        self.assertEqual(attempts, ["avc1", "mp4v"])
+
+    def test_auto_codec_prefers_listed_platform_hardware_encoder(self):
+        with patch.object(video, "_ffmpeg_encoders", return_value=frozenset({"libx264", "h264_videotoolbox"})):
+            with patch.object(video.sys, "platform", "darwin"):
+                self.assertEqual(video.resolve_ffmpeg_codec("auto"), "h264_videotoolbox")
+            with patch.object(video.sys, "platform", "linux"):
+                self.assertEqual(video.resolve_ffmpeg_codec("auto"), "libx264")
+            self.assertEqual(video.resolve_ffmpeg_codec("h264_nvenc"), "h264_nvenc")
+        with patch.object(video, "_ffmpeg_encoders", return_value=frozenset({"libx264"})):
+            with patch.object(video.sys, "platform", "darwin"):
+                self.assertEqual(video.resolve_ffmpeg_codec("auto"), "libx264")
+
+    def test_auto_codec_uses_nvenc_only_after_a_successful_probe(self):
+        with patch.object(video, "_ffmpeg_encoders", return_value=frozenset({"libx264", "h264_nvenc"})):
+            with patch.object(video.sys, "platform", "linux"):
+                with patch.object(video, "_encoder_works", return_value=True) as probe:
+                    self.assertEqual(video.resolve_ffmpeg_codec("auto"), "h264_nvenc")
+                probe.assert_called_once_with("h264_nvenc")
+                with patch.object(video, "_encoder_works", return_value=False):
+                    self.assertEqual(video.resolve_ffmpeg_codec("auto"), "libx264")
+
+    def test_start_reuses_running_controller(self):
+        launches = []
+
+        class FakeController:
+            def __init__(self, **kwargs):
+                launches.append(kwargs)
+                self.resets = []
+                self.last_event = SimpleNamespace(metadata={})
+
+            def reset(self, **kwargs):
+                self.resets.append(kwargs)
+
+            def step(self, **kwargs):
+                raise AssertionError(f"unexpected step: {kwargs}")
+
+        env = AI2ThorAdapter(profile="dev", dry_run=False)
+        with patch("smart_llm.environment.ai2thor_adapter.Controller", FakeController):
+            env.start(agent_count=1, record=False)
+            controller = env.context.controller
+            env.start(agent_count=2)
+
+        self.assertEqual(len(launches), 1)
+        self.assertIs(env.context.controller, controller)
+        self.assertEqual(controller.resets, [{"scene": "FloorPlan1", "agentCount": 2}])
+        self.assertEqual(env.context.agent_count, 2)
+
+    def test_start_renders_small_until_recording_begins(self):
+        launches = []
+
+        class FakeController:
+            def __init__(self, **kwargs):
+                launches.append(kwargs)
+                self.steps = []
+                self.last_event = SimpleNamespace(metadata={})
+
+            def reset(self, **kwargs):
+                _ = kwargs
+
+            def step(self, **kwargs):
+                self.steps.append(kwargs)
+                return self.last_event
+
+        env = AI2ThorAdapter(profile="dev", dry_run=False, record_agent_video=True)
+        env.capture_agent_frames = lambda *_args, **_kwargs: None
+        with patch("smart_llm.environment.ai2thor_adapter.Controller", FakeController):
+            env.start(agent_count=1, record=False)
+            env.start(agent_count=2)
+
+        self.assertEqual((launches[0]["width"], launches[0]["height"]), (320, 240))
+        self.assertEqual(env.context.controller.steps, [{"action": "ChangeResolution", "x": 800, "y": 600}])
+
+    def test_capture_path_is_bound_per_session(self):
+        class FakeController:
+            def __init__(self, **kwargs):
+                _ = kwargs
+                self.last_event = SimpleNamespace(metadata={})
+
+            def reset(self, **kwargs):
+                _ = kwargs
+
+            def step(self, **kwargs):
+                return self.last_event
+
+            def stop(self):
+                pass
+
+        captured = []
+        env = AI2ThorAdapter(profile="dev", dry_run=False, record_agent_video=True)
+        env.capture_agent_frames = lambda event=None, acting_agent_id=None: captured.append(acting_agent_id)
+        env.capture_overhead_frame = lambda event=None: self.fail("overhead stream is not recorded")
+        with patch("smart_llm.environment.ai2thor_adapter.Controller", FakeController):
+            env.start(agent_count=1, record=False)
+            env.capture_recordings(acting_agent_id=0)
+            self.assertEqual(captured, [])
+
+            env.start(agent_count=2)
+            env.capture_recordings(acting_agent_id=1)
+            env.stop()
+            env.capture_recordings(acting_agent_id=0)
+
+        self.assertEqual(captured, [None, 1])
+
+    def test_unrecorded_session_steps_skip_rendering(self):
+        class FakeController:
+            def __init__(self, **kwargs):
+                _ = kwargs
+                self.steps = []
+                self.last_event = SimpleNamespace(metadata={})
+
+            def reset(self, **kwargs):
+                _ = kwargs
+
+            def step(self, **kwargs):
+                self.steps.append(kwargs)
+                return self.last_event
+
+        env = AI2ThorAdapter(profile="dev", dry_run=False, record_agent_video=True)
+        env.capture_agent_frames = lambda *_args, **_kwargs: None
+        with patch("smart_llm.environment.ai2thor_adapter.Controller", FakeController):
+            env.start(agent_count=1, record=False)
+            env._steps().step(action="OpenObject", objectId="Fridge|1", agentId=0)
+            self.assertIs(env._steps().last_event, env.context.controller.last_event)
+            env.start(agent_count=1)
+            env._steps().step(action="OpenObject", objectId="Fridge|1", agentId=0)
+
+        self.assertEqual(
+            [step.get("renderImage") for step in env.context.controller.steps if step["action"] == "OpenObject"],
+            [False, None],
+        )
+
+    def test_failed_overhead_camera_disables_overhead_capture(self):
+        class FakeController:
+            def __init__(self, **kwargs):
+                _ = kwargs
+                self.last_event = SimpleNamespace(metadata={}, third_party_camera_frames=[])
+
+            def step(self, **kwargs):
+                if kwargs["action"] == "GetMapViewCameraProperties":
+                    return SimpleNamespace(metadata={"lastActionSuccess": True, "actionReturn": {"orthographicSize": 3.0}})
+                return SimpleNamespace(metadata={"lastActionSuccess": False}, third_party_camera_frames=[])
+
+        env = AI2ThorAdapter(profile="dev", dry_run=False, record_overhead_video=True)
+        env._open_video_writer = lambda *_args: self.fail("overhead writer must not be opened")
+        with patch("smart_llm.environment.ai2thor_adapter.Controller", FakeController):
+            env.start(agent_count=1)
+            env.capture_recordings()
+
+        self.assertIsNone(env.observer_camera_id)
+        self.assertEqual(env.artifacts(), {})
+
 
 if __name__ == "__main__":
     unittest.main()
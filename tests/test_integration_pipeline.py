@@ -1,6 +1,11 @@
 from __future__ import annotations
 
+import json
+import os
+import tempfile
+import threading
 import unittest
+from unittest.mock import patch
 import sys
 from pathlib import Path
 
@@ -10,7 +15,9 @@ if str(SRC) not in sys.path:
     sys.path.insert(0, str(SRC))
 
 from smart_llm.config import RuntimeConfig
-from smart_llm.pipeline import SMARTPipeline
+from smart_llm.llm import EchoAdapter
+from smart_llm.llm.adapters import ModelResponse
+from smart_llm.pipeline import RequestPacer, SMARTPipeline, _dump_json
 
 
 class DummyAdapter:
@@ -151,5 +158,139 @@ class TestIntegrationPipeline(unittest.TestCase):
         self.assertEqual(failed_goal_run.metrics["SR"], 0.0)
 
 
+    def test_consecutive_runs_share_one_environment(self):
+        pipeline = self._pipeline()
+        first = pipeline.run_once("불을 꺼줘")
+        env = pipeline._env
+        second = pipeline.run_once("토마토를 썰어서 냉장고에 넣고, 불을 꺼줘")
+
+        self.assertTrue(first.stage4["success"])
+        self.assertTrue(second.stage4["success"])
+        self.assertIsNotNone(env)
+        self.assertIs(pipeline._env, env)
+
+        pipeline.close()
+        self.assertIsNone(pipeline._env)
+
+    def test_plan_many_overlaps_llm_requests_and_keeps_each_response(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        class ConcurrentEchoAdapter(EchoAdapter):
+            def generate_text(self, prompt: str) -> ModelResponse:
+                barrier.wait()  # both requests must be in flight together
+                response = super().generate_text(prompt)
+                response.latency_ms = 1 if "토마토" in prompt else 2
+                return response
+
+        pipeline = self._pipeline()
+        pipeline.adapter = ConcurrentEchoAdapter()
+        commands = ["토마토를 썰어서 냉장고에 넣어줘", "불을 꺼줘"]
+        plans = pipeline.plan_many(commands)
+
+        self.assertEqual([response.latency_ms for _stage1, response in plans], [1, 2])
+        run = pipeline.run_once(commands[1], plan=plans[1])
+        self.assertTrue(run.stage4["success"])
+        self.assertEqual(run.stage1["llm"]["latency_ms"], 2)
+        self.assertEqual([s["task_type"] for s in run.stage1["subtasks"]], ["toggle_light"])
+
+    def test_plan_many_batches_commands_and_replans_missing_entries(self):
+        prompts = []
+
+        class BatchEchoAdapter(EchoAdapter):
+            def generate_text(self, prompt: str) -> ModelResponse:
+                prompts.append(prompt)
+                if '"plans"' not in prompt:
+                    return super().generate_text(prompt)
+                plan = json.loads(super().generate_text("User command:\n토마토를 썰어서 냉장고에 넣어줘\n\n").text)
+                return ModelResponse(text=json.dumps({"plans": [plan, "oops"]}), latency_ms=5, prompt_tokens=100)
+
+        pipeline = SMARTPipeline(RuntimeConfig(provider="echo", model="echo", dry_run=True, plan_batch_size=8))
+        pipeline.adapter = BatchEchoAdapter()
+        plans = pipeline.plan_many(["토마토를 썰어서 냉장고에 넣어줘", "불을 꺼줘"])
+
+        self.assertEqual(len(prompts), 2)
+        self.assertIn("1. 토마토를 썰어서 냉장고에 넣어줘\n2. 불을 꺼줘", prompts[0])
+        self.assertEqual([s.task_type for s in plans[0][0].subtasks], ["slice_and_store"])
+        self.assertEqual(plans[0][1].prompt_tokens, 50)
+        self.assertEqual([s.task_type for s in plans[1][0].subtasks], ["toggle_light"])
+        self.assertEqual(plans[1][1].latency_ms, 0)
+        pipeline.close()
+
+    def test_plan_cache_skips_the_llm_for_a_repeated_command(self):
+        calls = []
+
+        class CountingEchoAdapter(EchoAdapter):
+            def generate_text(self, prompt: str) -> ModelResponse:
+                calls.append(prompt)
+                return super().generate_text(prompt)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_path = str(Path(tmp) / "results" / ".plan_cache.json")
+            for _ in range(2):
+                pipeline = SMARTPipeline(RuntimeConfig(provider="echo", model="echo", dry_run=True, plan_cache_path=cache_path))
+                pipeline.adapter = CountingEchoAdapter()
+                run = pipeline.run_once("  불을 꺼줘")
+                pipeline.close()
+                self.assertEqual([s["task_type"] for s in run.stage1["subtasks"]], ["toggle_light"])
+
+            self.assertEqual(len(calls), 1)
+            self.assertNotIn("llm", run.stage1)
+
+            # Editing the prompt changes its fingerprint, so stale plans are not reused.
+            with patch("smart_llm.pipeline.prompt_fingerprint", return_value="edited"):
+                pipeline = SMARTPipeline(RuntimeConfig(provider="echo", model="echo", dry_run=True, plan_cache_path=cache_path))
+                pipeline.adapter = CountingEchoAdapter()
+                pipeline.run_once("불을 꺼줘")
+                pipeline.close()
+            self.assertEqual(len(calls), 2)
+
+    def test_plan_cache_writes_once_per_batch(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_path = Path(tmp) / ".plan_cache.json"
+            pipeline = SMARTPipeline(RuntimeConfig(provider="echo", model="echo", dry_run=True, plan_cache_path=str(cache_path)))
+            with patch("smart_llm.pipeline.os.replace", wraps=os.replace) as replace:
+                plans = pipeline.plan_many(["불을 꺼줘", "토마토를 썰어줘", "냉장고를 열어줘"])
+            pipeline.close()
+
+            self.assertEqual(len(plans), 3)
+            self.assertEqual(replace.call_count, 1)
+            self.assertEqual(len(json.loads(cache_path.read_text(encoding="utf-8"))), 3)
+
+    def test_context_manager_stops_session_env(self):
+        with patch("smart_llm.pipeline.AI2ThorAdapter.stop") as stop:
+            with self._pipeline() as pipeline:
+                pipeline.run_once("불을 꺼줘")
+                self.assertIsNotNone(pipeline._env)
+        self.assertIsNone(pipeline._env)
+        stop.assert_called_once()
+
+    def test_plan_cache_ignores_a_non_object_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_path = Path(tmp) / ".plan_cache.json"
+            cache_path.write_text("[]", encoding="utf-8")
+            pipeline = SMARTPipeline(RuntimeConfig(provider="echo", model="echo", dry_run=True, plan_cache_path=str(cache_path)))
+            plans = pipeline.plan_many(["불을 꺼줘"])
+            pipeline.close()
+
+            self.assertEqual(len(plans), 1)
+            self.assertEqual(len(json.loads(cache_path.read_text(encoding="utf-8"))), 1)
+
+    def test_dump_json_stdlib_fallback_matches_orjson(self):
+        value = {"불을 꺼줘": {"subtasks": [1, 2.5, None]}}
+        encoded = _dump_json(value)
+        with patch("smart_llm.pipeline.orjson", None):
+            self.assertEqual(_dump_json(value), encoded)
+        self.assertEqual(json.loads(encoded.decode("utf-8")), value)
+
+    def test_request_pacer_spaces_request_starts(self):
+        pacer = RequestPacer(qpm=1200)  # one start every 50 ms
+        with patch("smart_llm.pipeline.time.sleep") as sleep:
+            for _ in range(3):
+                pacer.wait()
+        waits = [call.args[0] for call in sleep.call_args_list]
+        self.assertEqual(len(waits), 2)
+        self.assertAlmostEqual(waits[1], 0.1, delta=0.02)
+        RequestPacer().wait()  # disabled pacer never sleeps
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import json
 import os
+import threading
 import unittest
 from unittest.mock import patch
 import sys
@@ -11,7 +13,7 @@ SRC = ROOT / "src"
 if str(SRC) not in sys.path:
     sys.path.insert(0, str(SRC))
 
-from smart_llm.llm.adapters import OpenAIAdapter, build_adapter
+from smart_llm.llm.adapters import OllamaAdapter, OpenAIAdapter, build_adapter
 
 
 class TestLLMAdapters(unittest.TestCase):
@@ -27,5 +29,157 @@ class TestLLMAdapters(unittest.TestCase):
                 OpenAIAdapter(model_name="gpt-4.1-mini")
 
 
+    def test_ollama_adapter_reuses_one_http_session(self):
+        class FakeResponse:
+            status_code = 200
+
+            @property
+            def content(self):
+                return json.dumps(self.json()).encode("utf-8")
+
+            def json(self):
+                return {"response": "{}", "prompt_eval_count": 3, "eval_count": 1}
+
+        class FakeSession:
+            created = 0
+
+            def __init__(self):
+                FakeSession.created += 1
+                self.posts = []
+
+            def post(self, url, **kwargs):
+                self.posts.append(url)
+                self.payload = kwargs["json"]
+                return FakeResponse()
+
+        adapter = OllamaAdapter(model_name="llama3", base_url="http://localhost:11434/")
+        with patch("requests.Session", FakeSession):
+            adapter.generate_text("a")
+            response = adapter.generate_text("b")
+
+        self.assertEqual(FakeSession.created, 1)
+        self.assertEqual(adapter._http().posts, ["http://localhost:11434/api/generate"] * 2)
+        self.assertEqual(response.prompt_tokens, 3)
+        self.assertNotIn("format", adapter._http().payload)
+
+    def test_ollama_json_stream_stops_after_the_object_closes(self):
+        def chunk(**fields):
+            return json.dumps(fields).encode()
+
+        class FakeStreamResponse:
+            status_code = 200
+            closed = False
+            drained = False
+
+            def __init__(self, lines):
+                self.lines = lines
+                self.read = 0
+
+            def iter_lines(self):
+                for line in self.lines:
+                    self.read += 1
+                    yield line
+                self.drained = True
+
+            def close(self):
+                self.closed = True
+
+        babbling = FakeStreamResponse(
+            [chunk(response='{"a": '), chunk(response='{"b": "}"}'), chunk(response="}"), chunk(response="\n")]
+            + [chunk(response=" ")] * 100
+        )
+        finished = FakeStreamResponse([chunk(response='{"a": 1}'), chunk(done=True, prompt_eval_count=7, eval_count=4)])
+        responses = [babbling, finished]
+
+        class FakeSession:
+            def post(self, url, **kwargs):
+                self.payload = kwargs["json"]
+                self.stream = kwargs["stream"]
+                return responses.pop(0)
+
+        adapter = OllamaAdapter(model_name="llama3", base_url="http://localhost:11434")
+        with patch("requests.Session", FakeSession):
+            self.assertEqual(adapter.generate_json("c"), {"a": {"b": "}"}})
+            self.assertEqual(adapter.last_response.prompt_tokens, 0)
+            self.assertEqual(adapter.generate_json("d"), {"a": 1})
+
+        self.assertEqual(babbling.read, 4)
+        self.assertTrue(babbling.closed)
+        # A finished stream is read to its end and left open for connection reuse.
+        self.assertTrue(finished.drained)
+        self.assertFalse(finished.closed)
+        self.assertEqual((adapter.last_response.prompt_tokens, adapter.last_response.completion_tokens), (7, 4))
+        self.assertEqual(adapter._http().payload["format"], "json")
+        self.assertTrue(adapter._http().payload["stream"] and adapter._http().stream)
+
+    def test_ollama_adapter_spreads_threads_over_servers(self):
+        class FakeResponse:
+            status_code = 200
+
+            @property
+            def content(self):
+                return json.dumps(self.json()).encode("utf-8")
+
+            def json(self):
+                return {"response": "{}"}
+
+        posted = []
+
+        class FakeSession:
+            def post(self, url, **kwargs):
+                posted.append(url)
+                return FakeResponse()
+
+        adapter = OllamaAdapter(model_name="llama3", base_url="http://a:11434, http://b:11435/")
+        with patch("requests.Session", FakeSession):
+            workers = [threading.Thread(target=adapter.generate_text, args=("p",)) for _ in range(2)]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            adapter.generate_text("main")
+            adapter.generate_text("main again")
+
+        self.assertEqual(sorted(posted[:2]), ["http://a:11434/api/generate", "http://b:11435/api/generate"])
+        self.assertEqual(posted[2], posted[3])
+
+    def test_ollama_adapter_rejects_a_base_url_without_servers(self):
+        with self.assertRaisesRegex(RuntimeError, "OLLAMA_BASE_URL"):
+            OllamaAdapter(model_name="llama3", base_url=" , ")
+
+    def test_ollama_adapter_follows_num_parallel(self):
+        with patch.dict(os.environ, {"OLLAMA_NUM_PARALLEL": "2"}, clear=False):
+            adapter = OllamaAdapter(model_name="llama3", base_url="http://localhost:11434")
+        self.assertEqual(adapter.max_concurrency, 2)
+
+        with patch.dict(os.environ, {"OLLAMA_NUM_PARALLEL": ""}, clear=False):
+            adapter = OllamaAdapter(model_name="llama3", base_url="http://localhost:11434")
+        self.assertIsNone(adapter.max_concurrency)
+
+    def test_openai_adapter_reports_cached_prompt_tokens(self):
+        class FakeResponse:
+            status_code = 200
+
+            @property
+            def content(self):
+                return json.dumps(self.json()).encode("utf-8")
+
+            def json(self):
+                return {
+                    "output_text": "{}",
+                    "usage": {"input_tokens": 2048, "output_tokens": 10, "input_tokens_details": {"cached_tokens": 1920}},
+                }
+
+        class FakeSession:
+            def post(self, url, **kwargs):
+                return FakeResponse()
+
+        adapter = OpenAIAdapter(model_name="gpt-4.1-mini", api_key="test-key")
+        with patch("requests.Session", FakeSession):
+            response = adapter.generate_text("prompt")
+
+        self.assertEqual(response.prompt_tokens, 2048)
+        self.assertEqual(response.cached_prompt_tokens, 1920)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from smart_llm.llm import LLMParseError, parse_json_robust
+from smart_llm.llm.parser import load_json
+
+
+class TestParseJsonRobust(unittest.TestCase):
+    def test_clean_json_skips_the_fallback_scans(self):
+        with patch("smart_llm.llm.parser._extract_braced_block") as scan:
+            self.assertEqual(parse_json_robust(' {"subtasks": []} '), {"subtasks": []})
+        scan.assert_not_called()
+
+    def test_recovers_fenced_and_embedded_objects(self):
+        self.assertEqual(parse_json_robust('Plan:\n```json\n{"a": 1}\n```'), {"a": 1})
+        self.assertEqual(parse_json_robust("Sure! {'a': 1,} done"), {"a": 1})
+        with self.assertRaises(LLMParseError):
+            parse_json_robust("no json here")
+
+    def test_load_json_accepts_what_the_stdlib_accepts(self):
+        self.assertEqual(load_json('{"명령": "토마토"}'.encode("utf-8")), {"명령": "토마토"})
+        self.assertNotEqual(load_json('{"x": NaN}')["x"], load_json('{"x": NaN}')["x"])
+        with self.assertRaises(ValueError):
+            load_json("{")
+
+    def test_load_json_stdlib_fallback_matches_orjson(self):
+        payload = '{"명령": "토마토", "n": [1, 2.5, null]}'.encode("utf-8")
+        with_orjson = load_json(payload)
+        with patch("smart_llm.llm.parser.orjson", None):
+            self.assertEqual(load_json(payload), with_orjson)
+            with self.assertRaises(ValueError):
+                load_json("{")
+
+
+if __name__ == "__main__":
+    unittest.main()
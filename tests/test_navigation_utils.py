@@ -10,7 +10,19 @@ SRC = ROOT / "src"
 if str(SRC) not in sys.path:
     sys.path.insert(0, str(SRC))
 
-from smart_llm.environment.navigation_utils import TIGHT_INTERACTION_AGENT_CLEARANCE, navigate_to_object
+from smart_llm.environment.navigation_utils import (
+    POSE_ATTEMPTS,
+    TIGHT_INTERACTION_AGENT_CLEARANCE,
+    ReachableGrid,
+    _align_to_pose_iter,
+    _visibility_sweep_iter,
+    calculate_angle,
+    calculate_distance,
+    check_visible_ids,
+    heading_error,
+    navigate_to_object,
+    normalize_angle,
+)
 
 
 def _agent_metadata(*, position, objects, action_return=None, success=True):
@@ -455,7 +467,10 @@ class TestNavigationUtils(unittest.TestCase):
         )
 
         self.assertTrue(success)
-        self.assertIn("TeleportFull", [action for action, _agent_id, _kwargs in controller.actions])
+        actions = [action for action, _agent_id, _kwargs in controller.actions]
+        self.assertIn("TeleportFull", actions)
+        # 다른 agent가 아무 칸도 막지 않으면 같은 GetInteractablePoses 질의를 반복하지 않는다.
+        self.assertEqual(actions.count("GetInteractablePoses"), 1)
 
     def test_navigate_prefers_closer_interactable_pose_over_shorter_path(self):
         controller = FakePoseRankingController()
@@ -490,6 +505,9 @@ class TestNavigationUtils(unittest.TestCase):
         self.assertTrue(teleports)
         self.assertAlmostEqual(teleports[0]["x"], -1.0)
         self.assertAlmostEqual(teleports[0]["z"], 0.0)
+        # 31개 pose 중 시도 순위에 들 수 있는 가까운 것들만 경로 길이를 묻는다.
+        path_queries = [action for action, _agent_id, _kwargs in controller.actions if action == "GetShortestPathToPoint"]
+        self.assertEqual(len(path_queries), POSE_ATTEMPTS)
 
     def test_navigate_strict_max_distance_skips_interactable_pose_that_is_still_too_far(self):
         controller = FakeStrictPickupController()
@@ -554,6 +572,269 @@ class TestNavigationUtils(unittest.TestCase):
         teleports = [kwargs for action, _agent_id, kwargs in controller.actions if action == "TeleportFull"]
         self.assertEqual(len(teleports), 1)
 
+    def test_navigate_reuses_supplied_reachable_positions(self):
+        controller = FakeMultiAgentController()
+
+        success = navigate_to_object(
+            controller,
+            agent_id=1,
+            object_type="Bread",
+            capture_callback=lambda *_args, **_kwargs: None,
+            max_distance=1.15,
+            reachable_positions=[{"x": -0.75, "y": 0.9, "z": -0.5}],
+        )
+
+        self.assertTrue(success)
+        actions = [action for action, _agent_id, _kwargs in controller.actions]
+        self.assertNotIn("GetReachablePositions", actions)
+        for action, _agent_id, kwargs in controller.actions:
+            if action in {"GetInteractablePoses", "GetShortestPathToPoint"}:
+                self.assertIs(kwargs.get("renderImage"), False)
+            else:
+                self.assertNotIn("renderImage", kwargs)
+
+    def test_navigate_accepts_candidate_hints_and_survives_stale_ones(self):
+        bread_id = "Bread|+00.50|+00.90|+00.30"
+        for hint in ({bread_id: 0}, {bread_id: 99}):
+            controller = FakeMultiAgentController()
+            success = navigate_to_object(
+                controller,
+                agent_id=1,
+                object_type="Bread",
+                capture_callback=lambda *_args, **_kwargs: None,
+                max_distance=1.15,
+                candidate_ids=hint,
+            )
+            self.assertTrue(success)
+
+    def test_navigate_skips_movement_when_target_is_already_in_reach(self):
+        controller = FakeMultiAgentController()
+        controller.last_event.events[1].metadata["objects"][0].update(visible=True, distance=0.8)
+
+        success = navigate_to_object(
+            controller,
+            agent_id=1,
+            object_type="Bread",
+            capture_callback=lambda *_args, **_kwargs: None,
+            max_distance=1.15,
+        )
+
+        self.assertTrue(success)
+        self.assertEqual(controller.actions, [])
+
+    def test_normalize_angle_wraps_into_half_open_range(self):
+        self.assertAlmostEqual(normalize_angle(190.0), -170.0)
+        self.assertAlmostEqual(normalize_angle(-190.0), 170.0)
+        self.assertAlmostEqual(normalize_angle(725.0), 5.0)
+        self.assertAlmostEqual(normalize_angle(180.0), 180.0)
+        self.assertAlmostEqual(normalize_angle(-180.0), 180.0)
+
+        origin = {"x": 0.0, "z": 0.0}
+        for target, rotation in [({"x": 1.0, "z": 0.0}, 0.0), ({"x": -1.0, "z": -1.0}, 170.0), ({"x": 0.0, "z": 1.0}, 350.0)]:
+            self.assertAlmostEqual(
+                heading_error(origin, target, rotation),
+                normalize_angle(calculate_angle(origin, target) - rotation),
+            )
+
+    def test_reachable_grid_matches_linear_scan(self):
+        positions = [
+            {"x": round(-2.0 + 0.25 * ix, 2), "y": 0.9, "z": round(-2.0 + 0.25 * iz, 2)}
+            for ix in range(17)
+            for iz in range(17)
+        ]
+        grid = ReachableGrid(positions)
+        center = {"x": 0.3, "y": 0.9, "z": -0.6}
+
+        expected = [idx for idx, pos in enumerate(positions) if calculate_distance(pos, center) <= 1.1]
+        self.assertEqual(grid.indices_within(center, 1.1), expected)
+
+        blockers = [{"x": 0.0, "y": 0.9, "z": 0.0}, {"x": 1.5, "y": 0.9, "z": 1.5}]
+        expected_blocked = {
+            idx
+            for idx, pos in enumerate(positions)
+            if any(calculate_distance(pos, blocker) < 0.75 for blocker in blockers)
+        }
+        self.assertEqual(grid.indices_near_any(blockers, 0.75), expected_blocked)
+
+        ranked = sorted(range(len(positions)), key=lambda idx: calculate_distance(positions[idx], center))
+        self.assertEqual(grid.nearest(center, 3), [positions[idx] for idx in ranked[:3]])
+        self.assertEqual(grid.nearest(center, 2, exclude={ranked[0]}), [positions[idx] for idx in ranked[1:3]])
+
+        indices = ranked[:5]
+        self.assertIsNone(grid.index_of({"x": 0.1, "y": 0.9, "z": 0.1}))
+        self.assertEqual(grid.index_of({"x": 0.26, "y": 0.9, "z": -0.02}), positions.index({"x": 0.25, "y": 0.9, "z": 0.0}))
+        for heading, idx in zip(grid.headings_to(indices, center), indices):
+            self.assertAlmostEqual(heading, calculate_angle(positions[idx], center))
+
+    def test_reachable_grid_path_lengths_route_around_gaps(self):
+        # 3x3 격자에서 가운데 칸을 제외하면 대각선 이동은 모서리를 돌아간다.
+        positions = [
+            {"x": 0.25 * ix, "y": 0.9, "z": 0.25 * iz}
+            for ix in range(3)
+            for iz in range(3)
+            if (ix, iz) != (1, 1)
+        ] + [{"x": 5.0, "y": 0.9, "z": 5.0}]
+        grid = ReachableGrid(positions)
+        start = positions.index({"x": 0.0, "y": 0.9, "z": 0.0})
+        lengths = grid.path_lengths_from(start)
+
+        self.assertAlmostEqual(lengths[positions.index({"x": 0.5, "y": 0.9, "z": 0.5})], 0.25 * (2 + 2**0.5))
+        self.assertEqual(lengths[-1], float("inf"))
+        self.assertIs(grid.path_lengths_from(start), lengths)
+
+    def test_reachable_grid_neighbors_match_radius_queries(self):
+        positions = [
+            {"x": 0.25 * ix + (0.01 if ix == 3 else 0.0), "y": 0.9, "z": 0.25 * iz}
+            for ix in range(6)
+            for iz in range(4)
+            if (ix + iz) % 5
+        ]
+        positions.reverse()
+        grid = ReachableGrid(positions)
+        radius = 0.25 * 2**0.5 + 1e-3
+        expected = [
+            [(other, calculate_distance(pos, positions[other])) for other in grid.indices_within(pos, radius) if other != idx]
+            for idx, pos in enumerate(positions)
+        ]
+
+        self.assertEqual(grid._build_neighbors(), expected)
+        self.assertEqual(ReachableGrid([])._build_neighbors(), [])
+
+    def test_navigate_ranks_connected_poses_without_path_queries(self):
+        controller = FakeManyPoseController()
+        grid_positions = [
+            {"x": round(-2.0 + 0.25 * ix, 2), "y": 0.9, "z": round(-2.0 + 0.25 * iz, 2)}
+            for ix in range(9)
+            for iz in range(9)
+        ]
+        poses = [
+            {"x": -1.0, "y": 0.9, "z": -1.0, "rotation": 0.0, "horizon": 0.0, "standing": True},
+            {"x": -1.0, "y": 0.9, "z": 0.0, "rotation": 90.0, "horizon": 0.0, "standing": True},
+        ]
+        original_step = controller.step
+
+        def step(action, agentId=None, **kwargs):
+            if action == "GetInteractablePoses":
+                controller.actions.append((action, agentId, kwargs))
+                event = controller._query_event(agentId, poses)
+                controller.last_event = event
+                return event
+            return original_step(action, agentId=agentId, **kwargs)
+
+        controller.step = step
+        success = navigate_to_object(
+            controller,
+            agent_id=1,
+            object_type="Bread",
+            capture_callback=lambda *_args, **_kwargs: None,
+            max_distance=1.15,
+            reachable_positions=grid_positions,
+        )
+
+        self.assertTrue(success)
+        actions = [action for action, _agent_id, _kwargs in controller.actions]
+        self.assertNotIn("GetShortestPathToPoint", actions)
+        teleports = [kwargs for action, _agent_id, kwargs in controller.actions if action == "TeleportFull"]
+        self.assertAlmostEqual(teleports[0]["z"], 0.0)
+
+    def test_check_visible_ids_uses_index_hints_and_survives_reordering(self):
+        objects = [
+            {"objectId": "Apple|1", "visible": True},
+            {"objectId": "Bread|1", "visible": False},
+            {"objectId": "Bread|2", "visible": True},
+        ]
+        hints = {"Bread|1": 1, "Bread|2": 2}
+        self.assertTrue(check_visible_ids({"objects": objects}, hints))
+        self.assertFalse(check_visible_ids({"objects": objects}, {"Bread|1": 1}))
+
+        reordered = [objects[2], objects[0], objects[1]]
+        self.assertTrue(check_visible_ids({"objects": reordered}, hints))
+        self.assertFalse(check_visible_ids({"objects": reordered}, {"Bread|1": 1}))
+
+    def test_visibility_sweep_looks_toward_object_first_and_can_skip_reset(self):
+        class FakeLookController:
+            def __init__(self, visible_after, horizon=0.0):
+                self.actions = []
+                self.visible_after = visible_after
+                self.horizon = horizon
+                self.last_event = self._event(False)
+
+            def _event(self, visible):
+                return SimpleNamespace(
+                    metadata={
+                        "agent": {"cameraHorizon": self.horizon},
+                        "cameraPosition": {"x": 0.0, "y": 1.5, "z": 0.0},
+                        "objects": [{"objectId": "Cabinet|1", "visible": visible}],
+                    }
+                )
+
+            def step(self, action, degrees, **kwargs):
+                self.actions.append((action, degrees))
+                self.horizon += degrees if action == "LookDown" else -degrees
+                self.last_event = self._event(action == self.visible_after)
+                return self.last_event
+
+        def run(controller, **kwargs):
+            sweep = _visibility_sweep_iter(controller, None, {"Cabinet|1"}, lambda *_args: None, **kwargs)
+            while True:
+                try:
+                    next(sweep)
+                except StopIteration as stop:
+                    return stop.value
+
+        high_target = {"x": 1.0, "y": 2.0, "z": 1.0}
+        controller = FakeLookController(visible_after="LookUp")
+        self.assertTrue(run(controller, target_pos=high_target))
+        self.assertEqual(controller.actions, [("LookUp", 30.0)])
+
+        controller = FakeLookController(visible_after=None)
+        self.assertFalse(run(controller, target_pos=high_target, reset_horizon=False))
+        self.assertEqual(controller.actions, [("LookUp", 30.0), ("LookDown", 60.0)])
+
+        controller = FakeLookController(visible_after=None)
+        self.assertFalse(run(controller, target_pos={"x": 1.0, "y": 0.5, "z": 1.0}))
+        self.assertEqual(controller.actions, [("LookDown", 30.0), ("LookUp", 60.0), ("LookDown", 30.0)])
+        self.assertEqual(controller.horizon, 0.0)
+
+        # 이미 최대로 내려다보는 중이면 막히는 LookDown 없이 위쪽만 보고 복귀한다.
+        controller = FakeLookController(visible_after=None, horizon=60.0)
+        self.assertFalse(run(controller, target_pos={"x": 1.0, "y": 0.5, "z": 1.0}))
+        self.assertEqual(controller.actions, [("LookUp", 30.0), ("LookDown", 30.0)])
+        self.assertEqual(controller.horizon, 60.0)
+
+
+    def test_align_to_pose_sets_rotation_and_horizon_in_one_teleport(self):
+        class FakeAlignController:
+            def __init__(self, teleport_ok=True):
+                self.actions = []
+                self.teleport_ok = teleport_ok
+                self.last_event = self._event(True)
+
+            def _event(self, success):
+                return SimpleNamespace(
+                    metadata={
+                        "agent": {"rotation": {"y": 0.0}, "cameraHorizon": 0.0},
+                        "lastActionSuccess": success,
+                    }
+                )
+
+            def step(self, action, **kwargs):
+                self.actions.append(action)
+                self.last_event = self._event(action != "Teleport" or self.teleport_ok)
+                return self.last_event
+
+        controller = FakeAlignController()
+        list(_align_to_pose_iter(controller, None, 90.0, 30.0, lambda *_args: None))
+        self.assertEqual(controller.actions, ["Teleport"])
+
+        controller = FakeAlignController(teleport_ok=False)
+        list(_align_to_pose_iter(controller, None, 90.0, 30.0, lambda *_args: None))
+        self.assertEqual(controller.actions, ["Teleport", "RotateRight", "LookDown"])
+
+        controller = FakeAlignController()
+        list(_align_to_pose_iter(controller, None, 90.0, 0.0, lambda *_args: None))
+        self.assertEqual(controller.actions, ["RotateRight"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import sys
+import unicodedata
 import unittest
 from pathlib import Path
 
@@ -9,6 +10,7 @@ SRC = ROOT / "src"
 if str(SRC) not in sys.path:
     sys.path.insert(0, str(SRC))
 
+from smart_llm.models import EnvironmentObject
 from smart_llm.schemas import SchemaValidator
 from smart_llm.stages.stage1_decomposition import Stage1Decomposer
 
@@ -127,5 +129,91 @@ class TestStage1Decomposition(unittest.TestCase):
         self.assertTrue(all(subtask.parallelizable for subtask in result.subtasks))
 
 
+    def test_prompt_lists_scene_objects_compactly(self):
+        decomposer = Stage1Decomposer(adapter=StaticAdapter({"subtasks": []}), validator=SchemaValidator())
+        tomato = EnvironmentObject(
+            objectType="Tomato",
+            state={"visible": True},
+            position={"x": 1.23456789, "y": 0.9, "z": -0.50000001},
+        )
+
+        prompt = decomposer._build_prompt(user_command="토마토", skills=[], objects=[tomato])
+
+        self.assertIn('{"objectType":"Tomato","state":{"visible":true},"position":{"x":1.23,"y":0.9,"z":-0.5}', prompt)
+
+    def test_decomposed_hangul_command_is_composed_before_planning(self):
+        prompts = []
+
+        class RecordingAdapter(StaticAdapter):
+            def generate_json(self, prompt: str):
+                prompts.append(prompt)
+                return self.payload
+
+        navigate_only = {
+            "subtasks": [
+                {
+                    "subtask_id": "S1",
+                    "task_type": "navigate",
+                    "description": "Go to the counter",
+                    "required_skills": ["navigate"],
+                    "dependencies": [],
+                    "parallelizable": True,
+                    "parameters": {"target_object": "CounterTop"},
+                    "code_draft": "navigate(CounterTop)",
+                }
+            ]
+        }
+        decomposer = Stage1Decomposer(adapter=RecordingAdapter(navigate_only), validator=SchemaValidator())
+        command = unicodedata.normalize("NFD", "토마토를  썰어줘 ")
+
+        result = decomposer.run(user_command=command, skills=[], objects=[])
+
+        self.assertIn("User command:\n토마토를 썰어줘\n", prompts[0])
+        self.assertEqual([subtask.task_type for subtask in result.subtasks], ["slice_and_store"])
+
+    def test_schema_capable_adapters_receive_the_stage1_schema(self):
+        schemas = []
+
+        class SchemaAdapter(StaticAdapter):
+            supports_json_schema = True
+
+            def generate_json(self, prompt: str, schema=None):
+                schemas.append(schema)
+                return {"plans": []}
+
+        decomposer = Stage1Decomposer(adapter=SchemaAdapter(None), validator=SchemaValidator())
+        self.assertEqual(decomposer.run_batch(["불을 꺼줘", "접시를 씻어줘"], skills=[], objects=[]), [None, None])
+
+        plans = schemas[0]["properties"]["plans"]
+        self.assertEqual((plans["minItems"], plans["maxItems"]), (2, 2))
+        self.assertIn("subtasks", plans["items"]["required"])
+
+    def test_batch_prompt_ends_with_the_batch_output_contract_only(self):
+        prompts = []
+
+        class RecordingAdapter(StaticAdapter):
+            def generate_json(self, prompt: str):
+                prompts.append(prompt)
+                return {"plans": []}
+
+        decomposer = Stage1Decomposer(adapter=RecordingAdapter(None), validator=SchemaValidator())
+        decomposer.run_batch(["불을 꺼줘", "접시를 씻어줘"], skills=[], objects=[])
+        single = decomposer._build_prompt(user_command="불을 꺼줘", skills=[], objects=[])
+
+        self.assertTrue(single.endswith("Return JSON matching output_schema exactly."))
+        self.assertNotIn("Return JSON matching output_schema exactly.", prompts[0])
+        self.assertTrue(prompts[0].endswith("every entry must match output_schema exactly."))
+        self.assertIn("lists 2 numbered commands", prompts[0])
+
+    def test_prompt_keeps_the_user_command_after_the_cacheable_prefix(self):
+        decomposer = Stage1Decomposer(adapter=StaticAdapter({"subtasks": []}), validator=SchemaValidator())
+
+        first = decomposer._build_prompt(user_command="토마토를 썰어줘", skills=[], objects=[])
+        second = decomposer._build_prompt(user_command="불을 꺼줘", skills=[], objects=[])
+
+        prefix = first[: first.index("User command:")]
+        self.assertTrue(second.startswith(prefix))
+        self.assertIn("Current Scene Objects", prefix)
+
 if __name__ == "__main__":
     unittest.main()
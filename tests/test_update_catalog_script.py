@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPT = ROOT / "scripts" / "update_ai2thor_catalog.py"
+
+_spec = importlib.util.spec_from_file_location("update_ai2thor_catalog", SCRIPT)
+catalog_script = importlib.util.module_from_spec(_spec)
+sys.modules[_spec.name] = catalog_script
+_spec.loader.exec_module(catalog_script)
+
+
+class TestSaveCatalog(unittest.TestCase):
+    def test_orjson_and_stdlib_write_the_same_file(self):
+        catalog = {"object_types": ["Apple", "Tomato"], "메모": "주방", "count": 2}
+        with tempfile.TemporaryDirectory() as tmp:
+            fast_path = Path(tmp) / "fast.json"
+            plain_path = Path(tmp) / "plain.json"
+            catalog_script.save_catalog(fast_path, catalog)
+            with patch.object(catalog_script, "orjson", None):
+                catalog_script.save_catalog(plain_path, catalog)
+
+            self.assertEqual(fast_path.read_bytes(), plain_path.read_bytes())
+            self.assertEqual(catalog_script.load_catalog(plain_path), catalog)
+            self.assertEqual(json.loads(fast_path.read_text(encoding="utf-8")), catalog)
+
+
+if __name__ == "__main__":
+    unittest.main()